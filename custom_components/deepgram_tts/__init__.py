@@ -12,10 +12,42 @@ from typing import TYPE_CHECKING
 
 from homeassistant.const import CONF_API_KEY, Platform
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 
-from .api import DeepgramTTSApiClient
+from .api import DeepgramTTSApiClient, create_speak_session
 from .api_models import DeepgramModelsClient
-from .const import DOMAIN, LOGGER
+from .cache import DeepgramAudioCache
+from .catalog import DeepgramModelsUpdater
+from .executor import AudioExecutor
+from .metrics import LatencyMetrics
+from .const import (
+    CACHE_DIRECTORY,
+    CACHE_DISK_MAX_BYTES,
+    CACHE_MEMORY_MAX_BYTES,
+    CONF_AUDIO_WORKERS,
+    CONF_HEDGING,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_LATENCY_METRICS,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_RETRIES,
+    CONF_PCM_PROCESSING,
+    CONF_PROCESS_POOL,
+    CONF_TRANSPORT,
+    DATA_CACHE,
+    DEFAULT_AUDIO_WORKERS,
+    DEFAULT_HEDGING,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DEFAULT_LATENCY_METRICS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_PCM_PROCESSING,
+    DEFAULT_PROCESS_POOL,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    LOGGER,
+    MODELS_TTL_S,
+    RATE_LIMIT_MAX_CONCURRENT,
+)
 from .stream_processor import DeepgramStreamProcessor
 from .tts import DeepgramTtsEntity
 
@@ -24,6 +56,7 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
 PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
     Platform.TTS,
 ]
 
@@ -35,22 +68,84 @@ async def async_setup_entry(
     api_key = entry.data.get(CONF_API_KEY) or entry.data.get("api_key")
     if not api_key:
         raise ValueError("No API key found in config entry data (neither CONF_API_KEY nor 'api_key').")
+    max_concurrency = entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+    # Dedicated pool so speak requests reuse warm connections. Every speak
+    # request holds a shared limiter slot, so the pool fits them all and the
+    # limiter alone decides when a request waits; the spare is for warm-ups.
+    session = create_speak_session(limit_per_host=RATE_LIMIT_MAX_CONCURRENT + 1)
+    entry.async_on_unload(session.close)
     client = DeepgramTTSApiClient(
         api_key=api_key,
-        session=async_get_clientsession(hass),
+        session=session,
+        max_retries=entry.options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+        hedging=entry.options.get(CONF_HEDGING, DEFAULT_HEDGING),
     )
+    warm_up_task = hass.async_create_background_task(
+        client.async_warm_up(max_concurrency), "deepgram_tts warm-up"
+    )
+    entry.async_on_unload(warm_up_task.cancel)
     models_client = DeepgramModelsClient(async_get_clientsession(hass))
-    models_data = await models_client.fetch_models()
-    client._models_cache = models_data.get("tts", [])
+    models_updater = DeepgramModelsUpdater(hass, models_client)
+    # Start from the stored catalog and revalidate it without blocking startup
+    if not await models_updater.async_load():
+        LOGGER.debug("No stored Deepgram model catalog, fetching it in the background")
+    refresh_task = hass.async_create_background_task(
+        models_updater.async_refresh(), "deepgram_tts models refresh"
+    )
+    entry.async_on_unload(refresh_task.cancel)
     hass.data.setdefault(DOMAIN, {})
-    processor = DeepgramStreamProcessor(client)
+    # One cache for all entries: they share the directory and its size limits
+    if (cache := hass.data[DOMAIN].get(DATA_CACHE)) is None:
+        cache = hass.data[DOMAIN][DATA_CACHE] = DeepgramAudioCache(
+            hass.config.path(CACHE_DIRECTORY),
+            memory_max_bytes=CACHE_MEMORY_MAX_BYTES,
+            disk_max_bytes=CACHE_DISK_MAX_BYTES,
+        )
+    await cache.async_load()
+    executor = AudioExecutor(
+        max_workers=entry.options.get(CONF_AUDIO_WORKERS, DEFAULT_AUDIO_WORKERS),
+        use_processes=entry.options.get(CONF_PROCESS_POOL, DEFAULT_PROCESS_POOL),
+    )
+    entry.async_on_unload(executor.shutdown)
+    metrics = (
+        LatencyMetrics() if entry.options.get(CONF_LATENCY_METRICS, DEFAULT_LATENCY_METRICS) else None
+    )
+    processor = DeepgramStreamProcessor(
+        client,
+        max_concurrency=max_concurrency,
+        cache=cache,
+        transport=entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+        pcm_processing=entry.options.get(CONF_PCM_PROCESSING, DEFAULT_PCM_PROCESSING),
+        executor=executor,
+        metrics=metrics,
+    )
     hass.data[DOMAIN][entry.entry_id] = {
         "client": client,
         "processor": processor,
+        "cache": cache,
+        "models": models_updater,
+        "metrics": metrics,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    keepalive_interval = entry.options.get(CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL)
+    if keepalive_interval:
+
+        async def _async_keep_warm(_now) -> None:
+            await client.async_warm_up(max_concurrency)
+
+        entry.async_on_unload(
+            async_track_time_interval(hass, _async_keep_warm, timedelta(seconds=keepalive_interval))
+        )
+
+    async def _async_refresh_models(_now) -> None:
+        await models_updater.async_refresh(force=True)
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_refresh_models, timedelta(seconds=MODELS_TTL_S))
+    )
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -2,12 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import random
 import socket
-from typing import Any
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterable, AsyncIterator, Callable
 
 import aiohttp
 import async_timeout
 
+from .const import (
+    DEFAULT_HEDGING,
+    DEFAULT_MAX_RETRIES,
+    LOGGER,
+    PRIORITY_ANNOUNCEMENT,
+    PRIORITY_INTERACTIVE,
+    RETRY_AFTER_DEFAULT_S,
+)
+from .limiter import DeepgramRateLimiter, get_rate_limiter
+
 
 class IntegrationBlueprintApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -47,6 +64,10 @@ class DeepgramTTSApiClientAuthenticationError(DeepgramTTSApiClientError):
     """Exception to indicate an authentication error."""
 
 
+class DeepgramTTSApiClientCircuitOpenError(DeepgramTTSApiClientCommunicationError):
+    """Exception to indicate requests are rejected while Deepgram is failing."""
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     """Verify that the response is valid."""
     if response.status in (401, 403):
@@ -55,6 +76,127 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     response.raise_for_status()
 
 
+def _retry_after_seconds(response: aiohttp.ClientResponse) -> float | None:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(exception: DeepgramTTSApiClientError) -> bool:
+    """Return True for transient failures: network errors, timeouts, 429 and 5xx."""
+    if isinstance(exception, DeepgramTTSApiClientCircuitOpenError) or not isinstance(
+        exception, DeepgramTTSApiClientCommunicationError
+    ):
+        return False
+    cause = exception.__cause__
+    if isinstance(cause, aiohttp.ClientResponseError):
+        return cause.status == 429 or cause.status >= 500
+    return True
+
+
+def _counts_against_breaker(exception: DeepgramTTSApiClientError) -> bool:
+    """Return True for failures that suggest Deepgram is down.
+
+    429 responses only mean requests are too frequent; the rate limiter
+    already backs off on them.
+    """
+    if not _is_retryable(exception):
+        return False
+    cause = exception.__cause__
+    return not (isinstance(cause, aiohttp.ClientResponseError) and cause.status == 429)
+
+
+class CircuitBreaker:
+    """Fail fast after repeated transient failures, probe again after a cool-down."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize the breaker in the closed state."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being rejected."""
+        return (
+            self._opened_at is not None
+            and time.monotonic() - self._opened_at < self._reset_timeout
+        )
+
+    def check(self) -> None:
+        """Raise if requests should not be attempted right now."""
+        if self._opened_at is None:
+            return
+        if self.is_open:
+            msg = "Deepgram API is unavailable, not sending request"
+            raise DeepgramTTSApiClientCircuitOpenError(msg)
+        # Half-open: let requests through, a single failure re-opens the circuit
+        self._opened_at = None
+        self._failures = self._failure_threshold - 1
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a transient failure and open the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= self._failure_threshold and self._opened_at is None:
+            LOGGER.warning(
+                "Deepgram API failed %d times in a row, pausing requests for %d s",
+                self._failures,
+                self._reset_timeout,
+            )
+            self._opened_at = time.monotonic()
+
+
+class _SharedRequest:
+    """A request awaited by concurrent identical calls."""
+
+    def __init__(self, future: asyncio.Future[bytes]) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+STREAM_CHUNK_SIZE = 4096
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_read=10)
+WARM_UP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+RETRY_BACKOFF_S = 0.25
+RETRY_BACKOFF_MAX_S = 2.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT_S = 30
+# Hedge once the first byte is later than this percentile of recent requests
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 120
+
+
+def create_speak_session(limit_per_host: int) -> aiohttp.ClientSession:
+    """Create a session with a connector tuned for repeated speak requests.
+
+    Connections are kept alive long enough to be reused between voice
+    replies and DNS answers are cached, so requests skip the handshake.
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
 class DeepgramTTSApiClient:
     """Deepgram TTS API Client."""
 
@@ -62,11 +204,47 @@ class DeepgramTTSApiClient:
         self,
         api_key: str,
         session: aiohttp.ClientSession,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        hedging: bool = DEFAULT_HEDGING,
+        limiter: DeepgramRateLimiter | None = None,
     ) -> None:
         """Initialize Deepgram TTS API client."""
         self._api_key = api_key
         self._session = session
+        # Shared with every other client using the same API key
+        self._limiter = limiter or get_rate_limiter(api_key)
+        self._max_retries = max_retries
+        self._hedging = hedging
+        self._breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT_S)
+        # Recent times to first byte, used to decide when to hedge
+        self._ttfb_samples: deque[float] = deque(maxlen=100)
         self._base_url = "https://api.deepgram.com/v1/speak"
+        self._ws_url = "wss://api.deepgram.com/v1/speak"
+        # Single-flight: identical concurrent syntheses share one request
+        self._in_flight: dict[tuple, _SharedRequest] = {}
+
+    async def async_warm_up(self, connections: int = 1) -> None:
+        """Open (or refresh) pooled connections to the Deepgram API.
+
+        The responses are discarded, only the established TLS connections
+        matter. Failures are logged and ignored.
+        """
+
+        async def _touch() -> None:
+            async with self._session.head(
+                self._base_url,
+                headers={"Authorization": f"Token {self._api_key}"},
+                timeout=WARM_UP_TIMEOUT,
+            ) as response:
+                await response.release()
+
+        results = await asyncio.gather(
+            *(_touch() for _ in range(max(1, connections))), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                LOGGER.debug("Connection warm-up failed: %s", result)
+                break
 
     async def async_test_api_key(self) -> None:
         """Test if the API key is valid by making a simple request."""
@@ -92,15 +270,18 @@ class DeepgramTTSApiClient:
         except Exception as exc:
             raise
 
-    async def async_synthesize_speech(
+    def _build_request(
         self,
-        text: str,
-        model: str = "aura-2-thalia-en",
-        encoding: str = "mp3",
-    ) -> bytes:
-        """Synthesize speech from text using Deepgram TTS API.
+        model: str,
+        encoding: str,
+        sample_rate: int | None = None,
+        bit_rate: int | None = None,
+        container: str | None = None,
+    ) -> tuple[dict, dict]:
+        """Build headers and query parameters for a speak request.
 
-        Returns audio data bytes.
+        Sample rate, bit rate and container are only sent when set, so
+        Deepgram applies its defaults for the encoding otherwise.
         """
         # Ensure model is not empty
         if not model or model.strip() == "":
@@ -114,18 +295,246 @@ class DeepgramTTSApiClient:
             "model": model,
             "encoding": encoding,
         }
+        if sample_rate:
+            params["sample_rate"] = sample_rate
+        if bit_rate:
+            params["bit_rate"] = bit_rate
+        if container:
+            params["container"] = container
+        return headers, params
+
+    async def async_synthesize_speech(
+        self,
+        text: str,
+        model: str = "aura-2-thalia-en",
+        encoding: str = "mp3",
+        priority: int = PRIORITY_ANNOUNCEMENT,
+        sample_rate: int | None = None,
+        bit_rate: int | None = None,
+        container: str | None = None,
+    ) -> bytes:
+        """Synthesize speech from text using Deepgram TTS API.
+
+        Returns audio data bytes. Concurrent calls with the same text,
+        parameters and priority share a single request and its result; the
+        request is aborted once every caller has been cancelled.
+        """
+        headers, params = self._build_request(model, encoding, sample_rate, bit_rate, container)
+        # Priority is part of the key: an urgent caller must not wait behind a
+        # deferred background request for the same text
+        key = (text, priority, tuple(sorted(params.items())))
+        if (request := self._in_flight.get(key)) is None:
+            request = _SharedRequest(
+                asyncio.ensure_future(self._async_post_speech(text, headers, params, priority))
+            )
+            self._in_flight[key] = request
+            request.future.add_done_callback(lambda future: self._on_request_done(key, request))
+        request.waiters += 1
         try:
-            async with async_timeout.timeout(30):
-                response = await self._session.post(
+            # Shield so one caller giving up does not cancel the others' request
+            return await asyncio.shield(request.future)
+        finally:
+            request.waiters -= 1
+            if not request.waiters and not request.future.done():
+                # Nobody is left waiting: free the limiter slot and stop using quota
+                self._in_flight.pop(key, None)
+                request.future.cancel()
+
+    def _on_request_done(self, key: tuple, request: _SharedRequest) -> None:
+        if self._in_flight.get(key) is request:
+            del self._in_flight[key]
+        future = request.future
+        if not future.cancelled():
+            # Mark the exception as retrieved in case every caller gave up
+            future.exception()
+
+    async def _async_post_speech(self, text: str, headers: dict, params: dict, priority: int) -> bytes:
+        """Post a speak request and return the whole response body."""
+        stream, first_chunk = await self._async_open_speech(text, headers, params, priority)
+        if first_chunk is None:
+            return b""
+        chunks = [first_chunk]
+        async for chunk in self._iter_after_first(stream):
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def async_stream_speech(
+        self,
+        text: str,
+        model: str = "aura-2-thalia-en",
+        encoding: str = "mp3",
+        priority: int = PRIORITY_INTERACTIVE,
+        sample_rate: int | None = None,
+        bit_rate: int | None = None,
+        container: str | None = None,
+        on_request_sent: Callable[[], None] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Synthesize speech and yield audio bytes as they arrive.
+
+        The response body is read in chunks, so the caller can forward audio
+        before Deepgram has finished rendering the whole text. Failures before
+        the first byte are retried; once audio has been yielded they are raised.
+        on_request_sent is called whenever a request leaves the rate limiter.
+        """
+        headers, params = self._build_request(model, encoding, sample_rate, bit_rate, container)
+        stream, first_chunk = await self._async_open_speech(text, headers, params, priority, on_request_sent)
+        if first_chunk is None:
+            return
+        try:
+            yield first_chunk
+            async for chunk in self._iter_after_first(stream):
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _iter_after_first(self, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Relay the rest of a response body, counting mid-body failures for the breaker."""
+        try:
+            async for chunk in stream:
+                yield chunk
+        except DeepgramTTSApiClientError as exception:
+            if _counts_against_breaker(exception):
+                self._breaker.record_failure()
+            raise
+        finally:
+            await stream.aclose()
+
+    async def _async_open_speech(
+        self,
+        text: str,
+        headers: dict,
+        params: dict,
+        priority: int,
+        on_request_sent: Callable[[], None] | None = None,
+    ) -> tuple[AsyncIterator[bytes], bytes | None]:
+        """Start a speak request and wait for its first chunk.
+
+        Retries transient failures with jittered exponential backoff and fails
+        fast while the circuit breaker is open. A request that still fails after
+        its retries counts as a single failure for the breaker.
+        """
+        attempt = 0
+        while True:
+            self._breaker.check()
+            try:
+                result = await self._async_first_chunk(text, headers, params, priority, on_request_sent)
+            except DeepgramTTSApiClientError as exception:
+                if not _is_retryable(exception):
+                    raise
+                if attempt >= self._max_retries:
+                    if _counts_against_breaker(exception):
+                        self._breaker.record_failure()
+                    raise
+                delay = random.uniform(0, min(RETRY_BACKOFF_MAX_S, RETRY_BACKOFF_S * 2**attempt))
+                attempt += 1
+                LOGGER.debug("Retrying speak request in %.2f s (attempt %d): %s", delay, attempt, exception)
+                await asyncio.sleep(delay)
+            else:
+                self._breaker.record_success()
+                return result
+
+    async def _async_first_chunk(
+        self,
+        text: str,
+        headers: dict,
+        params: dict,
+        priority: int,
+        on_request_sent: Callable[[], None] | None = None,
+    ) -> tuple[AsyncIterator[bytes], bytes | None]:
+        """Return a response stream and its first chunk (None for an empty body).
+
+        With hedging enabled, a duplicate request is sent when the first one has
+        not produced bytes within the usual time to first byte; the first to
+        answer wins and the other is cancelled. Time to first byte and the hedge
+        timer start once a request holds its limiter slot and is sent, so time
+        spent queued neither counts as latency nor triggers a duplicate.
+        """
+        sent_at: dict[str, float] = {}
+        primary_sent = asyncio.Event()
+
+        def on_primary_sent() -> None:
+            sent_at["primary"] = time.monotonic()
+            primary_sent.set()
+            if on_request_sent is not None:
+                on_request_sent()
+
+        def on_backup_sent() -> None:
+            sent_at["backup"] = time.monotonic()
+
+        primary = self._iter_speech(text, headers, params, priority, on_primary_sent)
+        first = asyncio.ensure_future(anext(primary, None))
+        candidates = {first: ("primary", primary)}
+        try:
+            hedge_delay = self._hedge_delay()
+            if hedge_delay is not None:
+                # Never hedge a request that is still waiting for a slot
+                sent = asyncio.ensure_future(primary_sent.wait())
+                try:
+                    await asyncio.wait({first, sent}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    sent.cancel()
+                if not first.done():
+                    done, _ = await asyncio.wait(candidates, timeout=hedge_delay)
+                    if not done:
+                        LOGGER.debug("No audio after %.3f s, hedging speak request", hedge_delay)
+                        backup = self._iter_speech(text, headers, params, priority, on_backup_sent)
+                        candidates[asyncio.ensure_future(anext(backup, None))] = ("backup", backup)
+            error: BaseException | None = None
+            while candidates:
+                done, _ = await asyncio.wait(candidates, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name, stream = candidates.pop(future)
+                    if (error := future.exception()) is None:
+                        if name in sent_at:
+                            self._ttfb_samples.append(time.monotonic() - sent_at[name])
+                        return stream, future.result()
+                    await stream.aclose()
+            raise error
+        finally:
+            # Cancel the losing (or abandoned) requests
+            for future, (_name, stream) in candidates.items():
+                future.cancel()
+                await asyncio.gather(future, return_exceptions=True)
+                await stream.aclose()
+
+    def _hedge_delay(self) -> float | None:
+        """Return the time to wait before hedging, or None if hedging is off."""
+        if not self._hedging or len(self._ttfb_samples) < HEDGE_MIN_SAMPLES:
+            return None
+        samples = sorted(self._ttfb_samples)
+        return samples[min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE))]
+
+    async def _iter_speech(
+        self,
+        text: str,
+        headers: dict,
+        params: dict,
+        priority: int,
+        on_request_sent: Callable[[], None] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Post a single speak request and yield the response body in chunks."""
+        try:
+            async with self._limiter.async_slot(len(text), priority):
+                if on_request_sent is not None:
+                    on_request_sent()
+                async with self._session.post(
                     self._base_url,
                     data=text.encode("utf-8"),
                     headers=headers,
                     params=params,
-                )
-                _verify_response_or_raise(response)
-                audio_bytes = await response.read()
-                return audio_bytes
-        except TimeoutError as exception:
+                    timeout=STREAM_TIMEOUT,
+                ) as response:
+                    if response.status == 429:
+                        self._limiter.pause(_retry_after_seconds(response) or RETRY_AFTER_DEFAULT_S)
+                    _verify_response_or_raise(response)
+                    try:
+                        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            yield chunk
+                    except (asyncio.CancelledError, GeneratorExit):
+                        # Abandoned mid-body: abort the transfer rather than pool the connection
+                        response.close()
+                        raise
+        except (TimeoutError, asyncio.TimeoutError) as exception:
             msg = f"Timeout error fetching information - {exception}"
             raise DeepgramTTSApiClientCommunicationError(
                 msg,
@@ -135,8 +544,91 @@ class DeepgramTTSApiClient:
             raise DeepgramTTSApiClientCommunicationError(
                 msg,
             ) from exception
+        except DeepgramTTSApiClientError:
+            raise
         except Exception as exception:  # pylint: disable=broad-except
             msg = f"Something really wrong happened! - {exception}"
             raise DeepgramTTSApiClientError(
                 msg,
             ) from exception
+
+    async def async_stream_speech_websocket(
+        self,
+        text_stream: AsyncIterable[str],
+        model: str = "aura-2-thalia-en",
+        encoding: str = "linear16",
+        sample_rate: int = 24000,
+    ) -> AsyncIterator[bytes]:
+        """Synthesize a stream of text over a single WebSocket session.
+
+        Each text piece is sent as a Speak message followed by a Flush, and audio
+        frames are yielded as soon as they arrive. Deepgram only streams raw
+        audio (linear16, mulaw, alaw) over WebSocket.
+        """
+        headers, params = self._build_request(model, encoding, sample_rate)
+        del headers["Content-Type"]
+        flushes_sent = 0
+        flushes_done = 0
+        sending_done = asyncio.Event()
+
+        async def send_text(ws: aiohttp.ClientWebSocketResponse) -> None:
+            nonlocal flushes_sent
+            try:
+                async for text in text_stream:
+                    await self._limiter.async_consume(len(text))
+                    await ws.send_str(json.dumps({"type": "Speak", "text": text}))
+                    await ws.send_str(json.dumps({"type": "Flush"}))
+                    flushes_sent += 1
+            finally:
+                sending_done.set()
+                if flushes_done >= flushes_sent:
+                    # All audio already received, make the receive loop end
+                    await ws.close()
+
+        self._breaker.check()
+        try:
+            async with self._limiter.async_slot(priority=PRIORITY_INTERACTIVE), self._session.ws_connect(
+                self._ws_url,
+                headers=headers,
+                params=params,
+                heartbeat=10,
+                timeout=aiohttp.ClientWSTimeout(ws_close=5),
+            ) as ws:
+                self._breaker.record_success()
+                sender = asyncio.create_task(send_text(ws))
+                try:
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.BINARY:
+                            yield msg.data
+                        elif msg.type == aiohttp.WSMsgType.TEXT:
+                            event = json.loads(msg.data)
+                            if event.get("type") == "Flushed":
+                                flushes_done += 1
+                                if sending_done.is_set() and flushes_done >= flushes_sent:
+                                    await ws.send_str(json.dumps({"type": "Close"}))
+                                    break
+                            elif event.get("type") == "Warning":
+                                LOGGER.warning("Deepgram WebSocket warning: %s", event)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            raise DeepgramTTSApiClientCommunicationError(
+                                f"WebSocket error - {ws.exception()}"
+                            )
+                    # Surface errors raised while reading the text stream
+                    await sender
+                finally:
+                    # Stop reading text before the socket is closed
+                    sender.cancel()
+                    await asyncio.gather(sender, return_exceptions=True)
+        except aiohttp.WSServerHandshakeError as exception:
+            if exception.status in (401, 403):
+                raise DeepgramTTSApiClientAuthenticationError("Invalid API key") from exception
+            msg = f"Error opening WebSocket - {exception}"
+            raise DeepgramTTSApiClientCommunicationError(
+                msg,
+            ) from exception
+        except (TimeoutError, asyncio.TimeoutError, aiohttp.ClientError, socket.gaierror) as exception:
+            self._breaker.record_failure()
+            msg = f"Error fetching information - {exception}"
+            raise DeepgramTTSApiClientCommunicationError(
+                msg,
+            ) from exception
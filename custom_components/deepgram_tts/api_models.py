@@ -13,3 +13,16 @@ class DeepgramModelsClient:
             response = await self._session.get(self._models_url)
             response.raise_for_status()
             return await response.json()
+
+    async def fetch_models_if_changed(self, etag: str | None = None) -> tuple[dict | None, str | None]:
+        """Fetch models unless they match etag.
+
+        Returns (None, etag) when the server answers 304 Not Modified.
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        async with async_timeout.timeout(10):
+            response = await self._session.get(self._models_url, headers=headers)
+            if response.status == 304:
+                return None, etag
+            response.raise_for_status()
+            return await response.json(), response.headers.get("ETag")
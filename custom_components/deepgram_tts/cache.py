@@ -0,0 +1,208 @@
+"""Content-addressed cache for synthesized Deepgram audio."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from collections import OrderedDict
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_FILE_SUFFIX = ".audio"
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class DeepgramAudioCache:
+    """Two-tier (memory LRU + disk) cache of synthesized audio."""
+
+    def __init__(
+        self,
+        directory: str | None,
+        memory_max_bytes: int,
+        disk_max_bytes: int,
+    ) -> None:
+        """Initialize the cache. Disk tier is disabled when directory is None."""
+        self._directory = directory
+        self._memory_max_bytes = memory_max_bytes
+        self._disk_max_bytes = disk_max_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> file size, least recently used first
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        # Keys whose disk file is being written
+        self._writing: set[str] = set()
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        text: str,
+        model: str,
+        encoding: str,
+        sample_rate: int | None = None,
+        bit_rate: int | None = None,
+        container: str | None = None,
+    ) -> str:
+        """Return the cache key for a synthesis request."""
+        fields = [normalize_text(text), model, encoding, str(sample_rate or "")]
+        if bit_rate or container:
+            # Only appended when set so existing mp3 entries keep their keys
+            fields += [str(bit_rate or ""), container or ""]
+        raw = "\x1f".join(fields)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key + CACHE_FILE_SUFFIX)
+
+    def _scan_directory(self) -> list[tuple[float, str, int]]:
+        os.makedirs(self._directory, exist_ok=True)
+        entries = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(CACHE_FILE_SUFFIX):
+                    stat = entry.stat()
+                    key = entry.name[: -len(CACHE_FILE_SUFFIX)]
+                    entries.append((stat.st_mtime, key, stat.st_size))
+        return sorted(entries)
+
+    async def async_load(self) -> None:
+        """Index the files already present in the disk tier, once per cache."""
+        async with self._load_lock:
+            if self._loaded or not self._directory:
+                return
+            self._loaded = True
+            try:
+                entries = await asyncio.to_thread(self._scan_directory)
+            except OSError as err:
+                _LOGGER.warning("Disabling disk audio cache, cannot use %s: %s", self._directory, err)
+                self._directory = None
+                return
+            for _mtime, key, size in entries:
+                if key not in self._disk:
+                    self._disk[key] = size
+                    self._disk_bytes += size
+            await self._async_evict_disk()
+
+    def get_memory(self, key: str) -> bytes | None:
+        """Return audio from the memory tier only, without touching the disk."""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+        return data
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Return cached audio, or None on a miss."""
+        if (data := self.get_memory(key)) is not None:
+            return data
+        if key in self._disk:
+            try:
+                data = await asyncio.to_thread(self._read_file, self._path(key))
+            except OSError as err:
+                _LOGGER.debug("Dropping unreadable cache entry %s: %s", key, err)
+                # May already be gone, evicted by a put while the file was read
+                if (size := self._disk.pop(key, None)) is not None:
+                    self._disk_bytes -= size
+            else:
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.disk_hits += 1
+                self._put_memory(key, data)
+                return data
+        self.misses += 1
+        return None
+
+    async def async_put(self, key: str, data: bytes) -> None:
+        """Store audio in both tiers."""
+        if not data:
+            return
+        self._put_memory(key, data)
+        if (
+            not self._directory
+            or key in self._disk
+            or key in self._writing
+            or len(data) > self._disk_max_bytes
+        ):
+            return
+        self._writing.add(key)
+        try:
+            await asyncio.to_thread(self._write_file, self._path(key), data)
+        except OSError as err:
+            _LOGGER.warning("Could not write audio cache entry: %s", err)
+            return
+        finally:
+            self._writing.discard(key)
+        # Indexed while the file was written, e.g. by the initial directory scan
+        if key in self._disk:
+            return
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        await self._async_evict_disk()
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self._memory_max_bytes:
+            return
+        if (old := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self._memory_max_bytes:
+            _key, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    async def _async_evict_disk(self) -> None:
+        victims = []
+        while self._disk_bytes > self._disk_max_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            victims.append(self._path(key))
+        if victims:
+            await asyncio.to_thread(self._remove_files, victims)
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as file:
+            data = file.read()
+        # Refresh mtime so LRU order survives restarts
+        os.utime(path)
+        return data
+
+    @staticmethod
+    def _write_file(path: str, data: bytes) -> None:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove_files(paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
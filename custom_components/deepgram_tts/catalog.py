@@ -0,0 +1,118 @@
+"""Deepgram model catalog indexes, persistence and refresh."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components.tts import Voice
+from homeassistant.helpers.storage import Store
+
+from .api_models import DeepgramModelsClient
+from .const import LOGGER, MODELS_STORAGE_KEY, MODELS_STORAGE_VERSION, MODELS_TTL_S
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+class DeepgramVoiceCatalog:
+    """Indexes over the Deepgram TTS model list, built once per refresh."""
+
+    def __init__(self, models: list[dict]) -> None:
+        """Build the language and voice indexes."""
+        self.models = models
+        self._by_name: dict[str, dict] = {}
+        self._voices_by_language: dict[str, list[Voice]] = {}
+        self._voice_by_full_language: dict[str, str] = {}
+        voices: list[tuple[str, str]] = []
+        for model in sorted(models, key=lambda model: model.get("name", "")):
+            canonical_name = model.get("canonical_name")
+            if not canonical_name:
+                continue
+            self._by_name[canonical_name] = model
+            voices.append((canonical_name, model.get("name", canonical_name)))
+            voice = Voice(canonical_name, model.get("name", canonical_name))
+            bases = set()
+            for lang in model.get("languages", []):
+                self._voice_by_full_language.setdefault(lang, canonical_name)
+                bases.add(lang.split("_")[0])
+            for base in bases:
+                self._voices_by_language.setdefault(base, []).append(voice)
+        # (canonical_name, display name) sorted by display name
+        self.voices = voices
+        # Base language codes ("en") and full codes ("en-US") as listed by Deepgram
+        self.languages = sorted(self._voices_by_language)
+        self.full_languages = sorted(self._voice_by_full_language)
+
+    def get_model(self, canonical_name: str) -> dict | None:
+        """Return the model with this canonical name."""
+        return self._by_name.get(canonical_name)
+
+    def voices_for_language(self, language: str) -> list[Voice]:
+        """Return the voices for a base language."""
+        return self._voices_by_language.get(language, [])
+
+    def voice_for_language(self, language: str) -> str | None:
+        """Return the first voice matching a full or base language code."""
+        if voice := self._voice_by_full_language.get(language):
+            return voice
+        if voices := self._voices_by_language.get(language.split("_")[0]):
+            return voices[0].voice_id
+        return None
+
+
+class DeepgramModelsUpdater:
+    """Keep the voice catalog in sync with a stored snapshot and the API."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        models_client: DeepgramModelsClient,
+    ) -> None:
+        """Initialize the updater."""
+        self._models_client = models_client
+        self.catalog = DeepgramVoiceCatalog([])
+        self._store: Store[dict] = Store(hass, MODELS_STORAGE_VERSION, MODELS_STORAGE_KEY)
+        self._etag: str | None = None
+        self._fetched_at = 0.0
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True if the catalog should be revalidated."""
+        return time.time() - self._fetched_at > MODELS_TTL_S
+
+    async def async_load(self) -> bool:
+        """Load the stored snapshot. Returns False if there is none."""
+        data = await self._store.async_load()
+        if not data or not data.get("models"):
+            return False
+        self._etag = data.get("etag")
+        self._fetched_at = data.get("fetched_at", 0.0)
+        self.catalog = DeepgramVoiceCatalog(data["models"])
+        return True
+
+    async def async_refresh(self, force: bool = False) -> None:
+        """Revalidate the catalog; keep the current one on any failure."""
+        if not force and not self.is_stale:
+            return
+        try:
+            models_data, etag = await self._models_client.fetch_models_if_changed(self._etag)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning("Could not refresh Deepgram models, keeping cached catalog: %s", exc)
+            return
+        self._fetched_at = time.time()
+        if models_data is not None:
+            models = models_data.get("tts", [])
+            if not models:
+                LOGGER.warning("Deepgram returned no TTS models, keeping cached catalog")
+                return
+            # Swap the whole catalog at once so readers never see a partial one
+            self.catalog = DeepgramVoiceCatalog(models)
+            self._etag = etag
+        await self._store.async_save(
+            {
+                "etag": self._etag,
+                "fetched_at": self._fetched_at,
+                "models": self.catalog.models,
+            }
+        )
@@ -17,7 +17,40 @@ from .api import (
     DeepgramTTSApiClientError,
 )
 from .api_models import DeepgramModelsClient
-from .const import DOMAIN, LOGGER
+from .catalog import DeepgramVoiceCatalog
+from .stream_processor import audio_format_errors
+from .const import (
+    CONF_AUDIO_WORKERS,
+    CONF_BIT_RATE,
+    CONF_ENCODING,
+    CONF_HEDGING,
+    CONF_KEEPALIVE_INTERVAL,
+    CONF_LATENCY_METRICS,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_RETRIES,
+    CONF_PCM_PROCESSING,
+    CONF_PROCESS_POOL,
+    CONF_SAMPLE_RATE,
+    CONF_TRANSPORT,
+    DEFAULT_AUDIO_WORKERS,
+    DEFAULT_BIT_RATE,
+    DEFAULT_ENCODING,
+    DEFAULT_HEDGING,
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DEFAULT_LATENCY_METRICS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_PCM_PROCESSING,
+    DEFAULT_PROCESS_POOL,
+    DEFAULT_SAMPLE_RATE,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    ENCODINGS,
+    LOGGER,
+    SAMPLE_RATES,
+    TRANSPORT_REST,
+    TRANSPORT_WEBSOCKET,
+)
 
 
 class DeepgramTTSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -126,15 +159,9 @@ class DeepgramTTSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_create_entry(title="Deepgram TTS", data=data)
 
         # Prepare options for voices and languages from fetched models
-        voices = []
-        languages = set()
-        for model in getattr(self, "_models", []):
-            voices.append((model["canonical_name"], model["name"]))
-            for lang in model.get("languages", []):
-                languages.add(lang)
-
-        language_options = sorted(languages)
-        voice_options = sorted(voices, key=lambda x: x[1])
+        catalog = DeepgramVoiceCatalog(getattr(self, "_models", []))
+        language_options = catalog.full_languages
+        voice_options = catalog.voices
 
         data_schema = vol.Schema(
             {
@@ -163,21 +190,24 @@ class DeepgramTTSOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry):
         pass
 
+    async def _async_get_catalog(self) -> DeepgramVoiceCatalog:
+        """Return the running entry's catalog, fetching models if it is not loaded."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if entry_data and entry_data["models"].catalog.models:
+            return entry_data["models"].catalog
+        session = async_create_clientsession(self.hass)
+        models_client = DeepgramModelsClient(session)
+        models_data = await models_client.fetch_models()
+        return DeepgramVoiceCatalog(models_data.get("tts", []))
+
     async def async_step_init(self, user_input=None):
         """Primer paso: seleccionar idioma base."""
         # Obtener valores actuales de options o data
         current_language = self.config_entry.options.get("language", self.config_entry.data.get("language", "en"))
 
         # Obtener modelos para mostrar idiomas base únicos
-        session = async_create_clientsession(self.hass)
-        models_client = DeepgramModelsClient(session)
-        models_data = await models_client.fetch_models()
-        languages = set()
-        for model in models_data.get("tts", []):
-            for lang in model.get("languages", []):
-                base = lang.split("_")[0]
-                languages.add(base)
-        language_options = sorted(languages)
+        catalog = await self._async_get_catalog()
+        language_options = catalog.languages
 
         if user_input is not None and "language" in user_input:
             # Guardar idioma seleccionado y pasar al siguiente paso
@@ -204,37 +234,91 @@ class DeepgramTTSOptionsFlowHandler(config_entries.OptionsFlow):
             return await self.async_step_init()
 
         # Obtener modelos para mostrar voces del idioma base seleccionado
-        session = async_create_clientsession(self.hass)
-        models_client = DeepgramModelsClient(session)
-        models_data = await models_client.fetch_models()
-        voices = []
-        def matches(lang_code):
-            return lang_code.split("_")[0] == selected_language
-        for model in models_data.get("tts", []):
-            if any(matches(lang) for lang in model.get("languages", [])):
-                voices.append((model["canonical_name"], model["name"]))
-        voice_options = sorted(voices, key=lambda x: x[1])
+        catalog = await self._async_get_catalog()
+        voice_options = [
+            (voice.voice_id, voice.name) for voice in catalog.voices_for_language(selected_language)
+        ]
 
         # Valor actual o por defecto
         current_voice = self.config_entry.options.get("voice", self.config_entry.data.get("voice", voice_options[0][0] if voice_options else ""))
+        current_concurrency = self.config_entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        current_transport = self.config_entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
+        current_keepalive = self.config_entry.options.get(CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL)
+        current_retries = self.config_entry.options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES)
+        current_hedging = self.config_entry.options.get(CONF_HEDGING, DEFAULT_HEDGING)
+        current_encoding = self.config_entry.options.get(CONF_ENCODING, DEFAULT_ENCODING)
+        current_sample_rate = self.config_entry.options.get(CONF_SAMPLE_RATE, DEFAULT_SAMPLE_RATE)
+        current_bit_rate = self.config_entry.options.get(CONF_BIT_RATE, DEFAULT_BIT_RATE)
+        current_pcm_processing = self.config_entry.options.get(CONF_PCM_PROCESSING, DEFAULT_PCM_PROCESSING)
+        current_audio_workers = self.config_entry.options.get(CONF_AUDIO_WORKERS, DEFAULT_AUDIO_WORKERS)
+        current_process_pool = self.config_entry.options.get(CONF_PROCESS_POOL, DEFAULT_PROCESS_POOL)
+        current_latency_metrics = self.config_entry.options.get(CONF_LATENCY_METRICS, DEFAULT_LATENCY_METRICS)
 
+        _errors = {}
         if user_input is not None and "voice" in user_input:
+            # Deepgram rejects rates that do not fit the encoding
+            _errors = audio_format_errors(
+                user_input.get(CONF_ENCODING, DEFAULT_ENCODING),
+                user_input.get(CONF_SAMPLE_RATE, DEFAULT_SAMPLE_RATE),
+                user_input.get(CONF_BIT_RATE, DEFAULT_BIT_RATE),
+            )
+        if user_input is not None and "voice" in user_input and not _errors:
             # Guardar idioma y voz seleccionados
             return self.async_create_entry(
                 title="",
                 data={
                     "language": selected_language,
                     "voice": user_input["voice"],
+                    CONF_MAX_CONCURRENCY: user_input.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+                    CONF_TRANSPORT: user_input.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+                    CONF_KEEPALIVE_INTERVAL: user_input.get(CONF_KEEPALIVE_INTERVAL, DEFAULT_KEEPALIVE_INTERVAL),
+                    CONF_MAX_RETRIES: user_input.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+                    CONF_HEDGING: user_input.get(CONF_HEDGING, DEFAULT_HEDGING),
+                    CONF_ENCODING: user_input.get(CONF_ENCODING, DEFAULT_ENCODING),
+                    CONF_SAMPLE_RATE: user_input.get(CONF_SAMPLE_RATE, DEFAULT_SAMPLE_RATE),
+                    CONF_BIT_RATE: user_input.get(CONF_BIT_RATE, DEFAULT_BIT_RATE),
+                    CONF_PCM_PROCESSING: user_input.get(CONF_PCM_PROCESSING, DEFAULT_PCM_PROCESSING),
+                    CONF_AUDIO_WORKERS: user_input.get(CONF_AUDIO_WORKERS, DEFAULT_AUDIO_WORKERS),
+                    CONF_PROCESS_POOL: user_input.get(CONF_PROCESS_POOL, DEFAULT_PROCESS_POOL),
+                    CONF_LATENCY_METRICS: user_input.get(CONF_LATENCY_METRICS, DEFAULT_LATENCY_METRICS),
                 },
             )
 
         data_schema = vol.Schema(
             {
                 vol.Required("voice", default=current_voice): vol.In([v[0] for v in voice_options]),
+                vol.Optional(CONF_MAX_CONCURRENCY, default=current_concurrency): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=8)
+                ),
+                vol.Optional(CONF_TRANSPORT, default=current_transport): vol.In(
+                    [TRANSPORT_REST, TRANSPORT_WEBSOCKET]
+                ),
+                vol.Optional(CONF_KEEPALIVE_INTERVAL, default=current_keepalive): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=3600)
+                ),
+                vol.Optional(CONF_MAX_RETRIES, default=current_retries): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=5)
+                ),
+                vol.Optional(CONF_HEDGING, default=current_hedging): bool,
+                vol.Optional(CONF_ENCODING, default=current_encoding): vol.In(ENCODINGS),
+                vol.Optional(CONF_SAMPLE_RATE, default=current_sample_rate): vol.In(SAMPLE_RATES),
+                vol.Optional(CONF_BIT_RATE, default=current_bit_rate): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=650000)
+                ),
+                vol.Optional(CONF_PCM_PROCESSING, default=current_pcm_processing): bool,
+                vol.Optional(CONF_AUDIO_WORKERS, default=current_audio_workers): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=8)
+                ),
+                vol.Optional(CONF_PROCESS_POOL, default=current_process_pool): bool,
+                vol.Optional(CONF_LATENCY_METRICS, default=current_latency_metrics): bool,
             }
         )
 
+        if _errors:
+            # Keep what was entered so only the rejected rate needs fixing
+            data_schema = self.add_suggested_values_to_schema(data_schema, user_input)
         return self.async_show_form(
             step_id="voice",
             data_schema=data_schema,
+            errors=_errors,
         )
@@ -6,3 +6,87 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "deepgram_tts"
 ATTRIBUTION = "Data provided by Deepgram Text-to-Speech API"
+
+CONF_MAX_CONCURRENCY = "max_concurrency"
+DEFAULT_MAX_CONCURRENCY = 3
+
+CONF_TRANSPORT = "transport"
+TRANSPORT_REST = "rest"
+TRANSPORT_WEBSOCKET = "websocket"
+DEFAULT_TRANSPORT = TRANSPORT_REST
+
+CONF_ENCODING = "encoding"
+ENCODING_MP3 = "mp3"
+ENCODING_LINEAR16 = "linear16"
+ENCODING_MULAW = "mulaw"
+ENCODING_OPUS = "opus"
+ENCODINGS = [ENCODING_MP3, ENCODING_LINEAR16, ENCODING_MULAW, ENCODING_OPUS]
+DEFAULT_ENCODING = ENCODING_MP3
+# Sample rate (Hz) and bit rate (bps), 0 leaves Deepgram's default for the encoding
+CONF_SAMPLE_RATE = "sample_rate"
+SAMPLE_RATES = [0, 8000, 16000, 24000, 32000, 48000]
+DEFAULT_SAMPLE_RATE = 0
+CONF_BIT_RATE = "bit_rate"
+DEFAULT_BIT_RATE = 0
+# Rates Deepgram accepts: sample rates for the raw encodings (mp3 and opus have a
+# fixed one), bit rates for mp3 and a bit rate range for opus
+ENCODING_SAMPLE_RATES = {
+    ENCODING_LINEAR16: (8000, 16000, 24000, 32000, 48000),
+    ENCODING_MULAW: (8000, 16000),
+}
+MP3_BIT_RATES = (32000, 48000)
+OPUS_BIT_RATE_MIN = 4000
+OPUS_BIT_RATE_MAX = 650000
+
+# Trim silence and normalize loudness of linear16 output (needs numpy). Each
+# sentence is processed whole, so streamed audio no longer arrives chunk by chunk
+CONF_PCM_PROCESSING = "pcm_processing"
+DEFAULT_PCM_PROCESSING = False
+
+# Workers for CPU-bound audio work (PCM processing, joins), optionally processes
+CONF_AUDIO_WORKERS = "audio_workers"
+DEFAULT_AUDIO_WORKERS = 2
+CONF_PROCESS_POOL = "process_pool"
+DEFAULT_PROCESS_POOL = False
+
+CONF_KEEPALIVE_INTERVAL = "keepalive_interval"
+# Seconds between connection warm-ups, 0 disables them
+DEFAULT_KEEPALIVE_INTERVAL = 60
+
+CONF_MAX_RETRIES = "max_retries"
+DEFAULT_MAX_RETRIES = 2
+CONF_HEDGING = "hedging"
+DEFAULT_HEDGING = False
+
+# Per-voice latency histograms of the streaming stages, with diagnostic sensors
+CONF_LATENCY_METRICS = "latency_metrics"
+DEFAULT_LATENCY_METRICS = False
+
+# Request priorities, lower values are served first. Interactive covers
+# streamed voice replies, announcement whole-message synthesis and
+# background cache prefetching, which waits while the others are running.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ANNOUNCEMENT = 1
+PRIORITY_BACKGROUND = 2
+
+# Shared per API key across all config entries
+RATE_LIMIT_MAX_CONCURRENT = 10
+RATE_LIMIT_CHARS_PER_SECOND = 500
+RATE_LIMIT_BURST_CHARS = 5000
+# The character bucket only applies for this long after a 429's pause ends
+RATE_LIMIT_THROTTLE_S = 60.0
+# Pause used when a 429 response carries no usable Retry-After header
+RETRY_AFTER_DEFAULT_S = 1.0
+
+SERVICE_PREFETCH = "prefetch"
+
+MODELS_STORAGE_KEY = f"{DOMAIN}.models"
+MODELS_STORAGE_VERSION = 1
+# Age after which the stored model catalog is revalidated against the API
+MODELS_TTL_S = 24 * 60 * 60
+
+CACHE_DIRECTORY = "deepgram_tts_cache"
+CACHE_MEMORY_MAX_BYTES = 8 * 1024 * 1024
+CACHE_DISK_MAX_BYTES = 100 * 1024 * 1024
+# hass.data[DOMAIN] key of the audio cache shared by all config entries
+DATA_CACHE = "cache"
@@ -0,0 +1,34 @@
+"""Diagnostics support for Deepgram TTS."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_API_KEY, "api_key"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry, with stage latencies when enabled."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    processor = entry_data["processor"]
+    metrics = entry_data["metrics"]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "latency_metrics": metrics.as_dict() if metrics is not None else None,
+        "voice_latency": processor.latency_stats,
+        "buffers": processor.buffer_stats,
+        "cache": entry_data["cache"].stats,
+    }
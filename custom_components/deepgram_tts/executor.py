@@ -0,0 +1,58 @@
+"""Bounded worker pool for CPU-bound audio work."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+from .const import DEFAULT_AUDIO_WORKERS, LOGGER
+
+_T = TypeVar("_T")
+
+
+class AudioExecutor:
+    """
+    Dedicated, size-limited executor for decoding, trimming and joining audio
+    so that bursts of requests neither block the event loop nor crowd Home
+    Assistant's shared default executor. Jobs beyond the pool size wait on the
+    event loop instead of piling up in the executor queue.
+
+    The process pool variant runs jobs in spawned worker processes; it only
+    accepts picklable module-level functions and arguments.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_AUDIO_WORKERS, use_processes: bool = False) -> None:
+        """Initialize the pool, workers are started on first use."""
+        self._max_workers = max(1, max_workers)
+        self._use_processes = use_processes
+        self._executor: Executor | None = None
+        self._slots = asyncio.Semaphore(self._max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._use_processes:
+                # Spawn rather than fork a process that runs an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    self._max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self._max_workers, thread_name_prefix="deepgram_tts_audio"
+                )
+        return self._executor
+
+    async def async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args) on the pool and return its result."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+
+    def shutdown(self) -> None:
+        """Stop the workers without waiting for queued jobs."""
+        if self._executor is not None:
+            LOGGER.debug("Shutting down audio executor")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
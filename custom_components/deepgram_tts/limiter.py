@@ -0,0 +1,173 @@
+"""Process-wide rate and concurrency limiting for Deepgram requests."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from .const import (
+    LOGGER,
+    PRIORITY_ANNOUNCEMENT,
+    PRIORITY_BACKGROUND,
+    RATE_LIMIT_BURST_CHARS,
+    RATE_LIMIT_CHARS_PER_SECOND,
+    RATE_LIMIT_MAX_CONCURRENT,
+    RATE_LIMIT_THROTTLE_S,
+)
+
+# One limiter per API key, shared by every client in the process
+_LIMITERS: dict[str, DeepgramRateLimiter] = {}
+
+
+def get_rate_limiter(api_key: str) -> DeepgramRateLimiter:
+    """Return the limiter shared by all clients using this API key."""
+    if (limiter := _LIMITERS.get(api_key)) is None:
+        limiter = _LIMITERS[api_key] = DeepgramRateLimiter(
+            RATE_LIMIT_MAX_CONCURRENT,
+            RATE_LIMIT_CHARS_PER_SECOND,
+            RATE_LIMIT_BURST_CHARS,
+        )
+    return limiter
+
+
+class DeepgramRateLimiter:
+    """Concurrency limit handed out by priority, plus a character token bucket.
+
+    Lower priority values are served first; requests of equal priority are
+    served in arrival order. Background requests are deferred while any
+    interactive or announcement request holds a slot and are limited to half
+    of the slots.
+
+    The bucket only throttles requests after Deepgram answered with a 429, for
+    RATE_LIMIT_THROTTLE_S past the Retry-After pause, so long messages are not
+    slowed down while the API keeps up.
+    """
+
+    def __init__(self, max_concurrent: int, chars_per_second: float, burst_chars: int) -> None:
+        """Initialize the limiter with a full bucket."""
+        self._max_concurrent = max_concurrent
+        self._chars_per_second = chars_per_second
+        self._burst_chars = burst_chars
+        self._tokens = float(burst_chars)
+        self._refilled_at = time.monotonic()
+        self._active = 0
+        # Slots held by requests above background priority
+        self._active_urgent = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # Set from Retry-After: no request starts before this time
+        self._paused_until = 0.0
+        # The character bucket applies until this time
+        self._throttled_until = 0.0
+
+    @property
+    def active(self) -> int:
+        """Return the number of requests holding a slot."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def async_slot(
+        self, chars: int = 0, priority: int = PRIORITY_ANNOUNCEMENT
+    ) -> AsyncIterator[None]:
+        """Hold a concurrency slot and consume chars from the bucket for a request."""
+        await self._async_acquire_slot(priority)
+        try:
+            await self.async_consume(chars)
+            yield
+        finally:
+            self._release_slot(priority)
+
+    async def async_consume(self, chars: int) -> None:
+        """Wait until any pause is over and, while throttled, chars can be taken from the bucket."""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            if now >= self._throttled_until:
+                return
+            self._tokens = min(
+                self._burst_chars,
+                self._tokens + (now - self._refilled_at) * self._chars_per_second,
+            )
+            self._refilled_at = now
+            # Requests longer than the burst only need a full bucket
+            needed = min(chars, self._burst_chars)
+            if self._tokens >= needed:
+                self._tokens -= chars
+                return
+            await asyncio.sleep((needed - self._tokens) / self._chars_per_second)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new requests after a 429 with Retry-After, then throttle characters."""
+        now = time.monotonic()
+        until = now + seconds
+        if until > self._paused_until:
+            LOGGER.warning("Deepgram rate limit hit, pausing requests for %.1f s", seconds)
+            self._paused_until = until
+        if now >= self._throttled_until:
+            # Start from an empty bucket that refills during the pause
+            self._tokens = 0.0
+            self._refilled_at = now
+        self._throttled_until = max(self._throttled_until, until + RATE_LIMIT_THROTTLE_S)
+
+    def _can_admit(self, priority: int) -> bool:
+        if self._active >= self._max_concurrent:
+            return False
+        if priority < PRIORITY_BACKGROUND:
+            return True
+        # Background work never takes more than half the slots, so an
+        # interactive request arriving mid-prefetch finds one free
+        return not self._active_urgent and self._active < max(1, self._max_concurrent // 2)
+
+    def _admit(self, priority: int) -> None:
+        self._active += 1
+        if priority < PRIORITY_BACKGROUND:
+            self._active_urgent += 1
+
+    async def _async_acquire_slot(self, priority: int) -> None:
+        if self._can_admit(priority) and (not self._waiters or self._waiters[0][0] > priority):
+            self._admit(priority)
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before cancellation
+                self._release_slot(priority)
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release_slot(self, priority: int) -> None:
+        self._active -= 1
+        if priority < PRIORITY_BACKGROUND:
+            self._active_urgent -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters in priority order."""
+        while self._waiters:
+            priority, _sequence, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_admit(priority):
+                # Everything behind this waiter has the same or lower priority
+                return
+            heapq.heappop(self._waiters)
+            self._admit(priority)
+            future.set_result(None)
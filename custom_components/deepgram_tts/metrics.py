@@ -0,0 +1,123 @@
+"""Latency histograms of the speech pipeline stages, per voice."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Stages of a streamed reply, each measured in seconds:
+# stream start to the first text chunk
+STAGE_TEXT_ARRIVAL = "text_arrival"
+# oldest unsent text to the chunk holding it being cut for synthesis
+STAGE_SEGMENTATION = "segmentation"
+# chunk cut to its speak request being sent (concurrency window, rate limiter)
+STAGE_REQUEST_QUEUE = "request_queue"
+# speak request sent to the first audio byte of the response
+STAGE_HTTP_TTFB = "http_ttfb"
+# first to last audio byte of the response
+STAGE_BODY = "body"
+# stream start to the first audio byte handed to Home Assistant
+STAGE_FIRST_AUDIO = "first_audio"
+STAGES = (
+    STAGE_TEXT_ARRIVAL,
+    STAGE_SEGMENTATION,
+    STAGE_REQUEST_QUEUE,
+    STAGE_HTTP_TTFB,
+    STAGE_BODY,
+    STAGE_FIRST_AUDIO,
+)
+
+# Upper bounds (ms) of the histogram buckets, 25% apart from 1 ms to about a minute
+BUCKET_BOUNDS_MS: tuple[float, ...] = tuple(round(1.25**exponent, 1) for exponent in range(50))
+PERCENTILES = (50, 90, 99)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram: recording is a bisect and an increment, and memory
+    does not grow with the number of samples. Percentiles are reported as the
+    upper bound of their bucket, so they are accurate to about 25%.
+    """
+
+    def __init__(self) -> None:
+        # One count per bucket plus one for samples above the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one sample."""
+        value_ms = max(0.0, seconds * 1000)
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the samples of another histogram."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the given percentile in ms, None without samples."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(BUCKET_BOUNDS_MS):
+                    break
+                return round(min(BUCKET_BOUNDS_MS[index], self.max_ms), 1)
+        return round(self.max_ms, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the sample count, mean, percentiles and maximum in ms."""
+        summary: dict[str, Any] = {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+        }
+        for percent in PERCENTILES:
+            summary[f"p{percent}_ms"] = self.percentile(percent)
+        summary["max_ms"] = round(self.max_ms, 1) if self.count else None
+        return summary
+
+
+class LatencyMetrics:
+    """Latency histograms per voice and stage, only created when metrics are enabled."""
+
+    def __init__(self) -> None:
+        self._voices: dict[str, dict[str, LatencyHistogram]] = {}
+
+    @property
+    def voices(self) -> list[str]:
+        """Return the voices with recorded samples."""
+        return list(self._voices)
+
+    def record(self, voice: str, stage: str, seconds: float) -> None:
+        """Add a sample for a stage of a voice."""
+        if (stages := self._voices.get(voice)) is None:
+            stages = self._voices[voice] = {}
+        if (histogram := stages.get(stage)) is None:
+            histogram = stages[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def histogram(self, stage: str, voice: str | None = None) -> LatencyHistogram:
+        """Return the histogram of a stage for one voice, or merged over all voices."""
+        merged = LatencyHistogram()
+        for name, stages in self._voices.items():
+            if (voice is None or name == voice) and stage in stages:
+                merged.merge(stages[stage])
+        return merged
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return the summary of every stage, per voice."""
+        return {
+            voice: {stage: stages[stage].as_dict() for stage in STAGES if stage in stages}
+            for voice, stages in self._voices.items()
+        }
@@ -0,0 +1,214 @@
+"""MPEG layer III frame scanning for joining mp3 fragments without decoding."""
+
+from __future__ import annotations
+
+from collections import deque
+
+# Bit rates (kbps) by bitrate index, for MPEG-1 and for MPEG-2/2.5 layer III
+BITRATES_MPEG1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+BITRATES_MPEG2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by version bits (3 MPEG-1, 2 MPEG-2, 0 MPEG-2.5) and rate index
+SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+# Samples every mp3 decoder outputs before the encoder's own delay
+DECODER_DELAY = 529
+# Encoders that write a LAME extension after the Xing/Info header
+LAME_TAGS = (b"LAME", b"Lavf", b"Lavc", b"L3.9")
+
+
+def id3v2_size(data: memoryview) -> int | None:
+    """Return the size of an ID3v2 tag at the start of data, 0 if there is none,
+    or None if more data is needed to tell."""
+    if len(data) < 10:
+        return None if data[: len(data)] == b"ID3"[: len(data)] else 0
+    if data[:3] != b"ID3":
+        return 0
+    size = 0
+    # Syncsafe integer: 7 bits per byte
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    # Header, plus footer when flagged
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+
+def parse_header(data: memoryview, pos: int) -> tuple[int, int, int] | None:
+    """Return (frame length, samples per frame, side info size) for a layer III
+    frame header at pos, or None if there is no valid header there."""
+    if data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 0x03
+    layer = (data[pos + 1] >> 1) & 0x03
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 0x03
+    # Reserved version, other layers, free format and invalid indexes
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    padding = (data[pos + 2] >> 1) & 0x01
+    mono = data[pos + 3] >> 6 == 3
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        bitrate = BITRATES_MPEG1[bitrate_index] * 1000
+        return 144 * bitrate // sample_rate + padding, 1152, 17 if mono else 32
+    bitrate = BITRATES_MPEG2[bitrate_index] * 1000
+    return 72 * bitrate // sample_rate + padding, 576, 9 if mono else 17
+
+
+def scan_frames(
+    data: memoryview, final: bool = False
+) -> tuple[list[tuple[int, int, int, int]], int]:
+    """
+    Index the complete frames in data as (offset, length, samples, side info
+    size), skipping ID3v2 tags and resynchronizing over junk such as ID3v1
+    trailers. Also return how many bytes were consumed; the rest is an
+    incomplete frame or tag that needs more data, unless final.
+    """
+    frames = []
+    pos = 0
+    end = len(data)
+    while pos < end:
+        if data[pos] == 0x49:  # "I", possibly an ID3v2 tag
+            size = id3v2_size(data[pos:])
+            if size is None or (size and pos + size > end):
+                break
+            if size:
+                pos += size
+                continue
+        if end - pos < 4:
+            break
+        header = parse_header(data, pos)
+        if header is None:
+            pos += 1
+            continue
+        length = header[0]
+        if pos + length > end:
+            break
+        frames.append((pos, length, header[1], header[2]))
+        pos += length
+    return frames, end if final else pos
+
+
+def read_info_frame(frame: memoryview, side_info: int) -> tuple[int, int] | None:
+    """
+    If frame is a Xing/Info or VBRI header frame rather than audio, return the
+    encoder delay and padding in samples (0 when not recorded), else None.
+    """
+    pos = 4 + side_info
+    if frame[pos : pos + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(frame[pos + 4 : pos + 8], "big")
+        # Optional frame count, byte count, TOC and quality fields
+        pos += 8 + 4 * bool(flags & 1) + 4 * bool(flags & 2) + 100 * bool(flags & 4) + 4 * bool(flags & 8)
+        if len(frame) >= pos + 24 and frame[pos : pos + 4] in LAME_TAGS:
+            delay = frame[pos + 21 : pos + 24]
+            return delay[0] << 4 | delay[1] >> 4, (delay[1] & 0x0F) << 8 | delay[2]
+        return 0, 0
+    if frame[36:40] == b"VBRI":
+        return int.from_bytes(frame[42:44], "big"), 0
+    return None
+
+
+def main_data_begin(frame: memoryview) -> int:
+    """Return how many bytes of the frame's main data lie in earlier frames (bit reservoir)."""
+    # Side info follows the header and the CRC, when there is one
+    pos = 4 if frame[1] & 0x01 else 6
+    if (frame[1] >> 3) & 0x03 == 3:
+        # MPEG-1: 9 bits
+        return frame[pos] << 1 | frame[pos + 1] >> 7
+    return frame[pos]
+
+
+def _first_kept(frames: list, lead: int) -> int:
+    """
+    Return the index of the first frame to keep when lead frames hold only
+    encoder delay. The cut moves earlier while the frame after it draws on the
+    bit reservoir, whose bytes would otherwise be dropped with the delay frames.
+    """
+    while lead and lead < len(frames) and main_data_begin(frames[lead]):
+        lead -= 1
+    return lead
+
+
+def _gapless_counts(info: tuple[int, int], samples: int) -> tuple[int, int]:
+    """Return how many whole frames hold only encoder delay and padding."""
+    delay, padding = info
+    return (delay + DECODER_DELAY) // samples, max(0, padding - DECODER_DELAY) // samples
+
+
+def audio_frames(fragment: bytes) -> list[memoryview]:
+    """
+    Return the audio frames of a complete mp3 fragment as views into it, without
+    tags, the Xing/Info frame or frames holding only encoder delay or padding.
+    Leading delay frames are kept when the first audio frame needs their bit
+    reservoir.
+    """
+    view = memoryview(fragment)
+    frames, _consumed = scan_frames(view, final=True)
+    if not frames:
+        return []
+    lead = trail = 0
+    offset, length, samples, side_info = frames[0]
+    if (info := read_info_frame(view[offset : offset + length], side_info)) is not None:
+        frames = frames[1:]
+        lead, trail = _gapless_counts(info, samples)
+    views = [view[offset : offset + length] for offset, length, _samples, _side in frames]
+    return views[_first_kept(views, lead) : len(views) - trail]
+
+
+def join_mp3(fragments: list[bytes]) -> bytes:
+    """Join complete mp3 fragments into a single gapless stream of bare frames."""
+    return b"".join(frame for fragment in fragments for frame in audio_frames(fragment))
+
+
+class Mp3FrameFilter:
+    """
+    Incremental audio_frames for one fragment arriving in chunks. Frames are
+    released as soon as they are complete, except the leading ones that the
+    LAME tag reports as delay, which are held until the first audio frame shows
+    whether it needs their bit reservoir, and the trailing padding ones, which
+    are held back and dropped at the end.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._started = False
+        self._lead = 0
+        self._leading: list[bytes] = []
+        self._hold = 0
+        self._held: deque[bytes] = deque()
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Add a chunk and return the audio frames completed by it."""
+        self._buffer += chunk
+        data, consumed = self._take()
+        del self._buffer[:consumed]
+        return data
+
+    def _take(self) -> tuple[bytes, int]:
+        # Views into the buffer must be gone before it is resized
+        view = memoryview(self._buffer)
+        frames, consumed = scan_frames(view)
+        out: list[memoryview | bytes] = []
+        for offset, length, samples, side_info in frames:
+            frame = view[offset : offset + length]
+            if not self._started:
+                self._started = True
+                if (info := read_info_frame(frame, side_info)) is not None:
+                    self._lead, self._hold = _gapless_counts(info, samples)
+                    continue
+            if not self._lead:
+                self._release(frame, out)
+                continue
+            self._leading.append(bytes(frame))
+            # Wait for the first frame after the delay frames
+            if len(self._leading) > self._lead:
+                for kept in self._leading[_first_kept(self._leading, self._lead) :]:
+                    self._release(kept, out)
+                self._lead = 0
+                self._leading = []
+        return b"".join(out), consumed
+
+    def _release(self, frame: memoryview | bytes, out: list[memoryview | bytes]) -> None:
+        if not self._hold:
+            out.append(frame)
+            return
+        self._held.append(bytes(frame))
+        if len(self._held) > self._hold:
+            out.append(self._held.popleft())
@@ -0,0 +1,81 @@
+"""Silence trimming and loudness normalization for 16-bit PCM fragments."""
+
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+# Loudness is measured over 10 ms windows; windows below the threshold are silence
+WINDOW_MS = 10
+SILENCE_THRESHOLD_DBFS = -45.0
+# Silence kept around speech so sentences do not run into each other
+KEEP_LEADING_MS = 30
+KEEP_TRAILING_MS = 120
+# Cut points move to the nearest zero crossing within this distance to avoid clicks
+ZERO_CROSSING_SEARCH_MS = 5
+# Speech RMS every fragment is brought to, with the gain applied bounded
+TARGET_RMS_DBFS = -20.0
+MAX_GAIN_DB = 12.0
+MIN_GAIN_DB = -12.0
+PEAK_CEILING = 0.98
+
+FULL_SCALE = 32768.0
+
+
+def _db_to_amplitude(db: float) -> float:
+    return FULL_SCALE * 10 ** (db / 20)
+
+
+def _nearest_zero_crossing(samples: np.ndarray, index: int, search: int) -> int:
+    """Return the sample index closest to index where the signal changes sign."""
+    start = max(0, index - search)
+    stop = min(len(samples) - 1, index + search)
+    if stop <= start:
+        return index
+    segment = samples[start : stop + 1]
+    crossings = np.flatnonzero(np.signbit(segment[:-1]) != np.signbit(segment[1:])) + start + 1
+    if not len(crossings):
+        return index
+    return int(crossings[np.argmin(np.abs(crossings - index))])
+
+
+def process_pcm(pcm: bytes, sample_rate: int) -> bytes:
+    """
+    Trim leading and trailing silence and normalize the loudness of one
+    little-endian 16-bit mono fragment. Fragments without speech are returned
+    unchanged.
+    """
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    window = max(1, sample_rate * WINDOW_MS // 1000)
+    windows = len(samples) // window
+    if not windows:
+        return pcm
+
+    frames = samples[: windows * window].reshape(windows, window).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    voiced = np.flatnonzero(rms >= _db_to_amplitude(SILENCE_THRESHOLD_DBFS))
+    if not len(voiced):
+        return pcm
+
+    search = sample_rate * ZERO_CROSSING_SEARCH_MS // 1000
+    start = max(0, voiced[0] * window - sample_rate * KEEP_LEADING_MS // 1000)
+    stop = min(len(samples), (voiced[-1] + 1) * window + sample_rate * KEEP_TRAILING_MS // 1000)
+    if start > 0:
+        start = _nearest_zero_crossing(samples, start, search)
+    if stop < len(samples):
+        stop = _nearest_zero_crossing(samples, stop, search)
+    trimmed = samples[start:stop].astype(np.float32)
+
+    # Gain from the RMS of speech windows only, so pauses do not skew it
+    speech_rms = float(np.sqrt(np.mean(np.square(rms[voiced]))))
+    gain_db = min(MAX_GAIN_DB, max(MIN_GAIN_DB, TARGET_RMS_DBFS - 20 * np.log10(speech_rms / FULL_SCALE)))
+    gain = 10 ** (gain_db / 20)
+    peak = float(np.max(np.abs(trimmed))) if len(trimmed) else 0.0
+    if peak:
+        gain = min(gain, PEAK_CEILING * FULL_SCALE / peak)
+    trimmed *= gain
+    return np.clip(trimmed, -FULL_SCALE, FULL_SCALE - 1).astype("<i2").tobytes()
@@ -0,0 +1,86 @@
+"""Deepgram TTS latency sensors for Home Assistant."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .metrics import (
+    STAGE_BODY,
+    STAGE_FIRST_AUDIO,
+    STAGE_HTTP_TTFB,
+    STAGE_REQUEST_QUEUE,
+    STAGE_SEGMENTATION,
+    STAGE_TEXT_ARRIVAL,
+    STAGES,
+    LatencyMetrics,
+)
+
+# State is read from the in-memory histograms, polling only writes it out
+SCAN_INTERVAL = timedelta(seconds=30)
+
+STAGE_NAMES = {
+    STAGE_TEXT_ARRIVAL: "text arrival",
+    STAGE_SEGMENTATION: "segmentation",
+    STAGE_REQUEST_QUEUE: "request queue",
+    STAGE_HTTP_TTFB: "HTTP time to first byte",
+    STAGE_BODY: "response body",
+    STAGE_FIRST_AUDIO: "time to first audio",
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up latency sensors when latency metrics are enabled."""
+    metrics = hass.data[DOMAIN][config_entry.entry_id]["metrics"]
+    if metrics is None:
+        return
+    async_add_entities(
+        DeepgramLatencySensor(config_entry, metrics, stage) for stage in STAGES
+    )
+
+
+class DeepgramLatencySensor(SensorEntity):
+    """90th percentile latency of one pipeline stage across all voices."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, config_entry: ConfigEntry, metrics: LatencyMetrics, stage: str) -> None:
+        """Initialize the sensor for a stage."""
+        self._metrics = metrics
+        self._stage = stage
+        self._attr_name = f"Deepgram TTS {STAGE_NAMES[stage]} p90"
+        self._attr_unique_id = f"{config_entry.entry_id}_{stage}_p90"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the 90th percentile in ms, unknown until a sample is recorded."""
+        return self._metrics.histogram(self._stage).percentile(90)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the full summary and the 90th percentile per voice."""
+        return {
+            **self._metrics.histogram(self._stage).as_dict(),
+            "voices": {
+                voice: self._metrics.histogram(self._stage, voice).percentile(90)
+                for voice in self._metrics.voices
+            },
+        }
@@ -3,28 +3,463 @@ from __future__ import annotations
 import asyncio
 import re
 import logging
-import io
-from typing import AsyncIterable, AsyncGenerator
+import struct
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterable, AsyncGenerator, Callable
 
-try:
-    from pydub import AudioSegment
-except ImportError:
-    AudioSegment = None
+from .cache import DeepgramAudioCache
+from .executor import AudioExecutor
+from .metrics import (
+    STAGE_BODY,
+    STAGE_FIRST_AUDIO,
+    STAGE_HTTP_TTFB,
+    STAGE_REQUEST_QUEUE,
+    STAGE_SEGMENTATION,
+    STAGE_TEXT_ARRIVAL,
+    LatencyMetrics,
+)
+from .mp3 import Mp3FrameFilter, join_mp3
+from .pcm import NUMPY_AVAILABLE, process_pcm
+from .const import (
+    CONF_BIT_RATE,
+    CONF_SAMPLE_RATE,
+    DEFAULT_ENCODING,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PCM_PROCESSING,
+    DEFAULT_TRANSPORT,
+    ENCODING_LINEAR16,
+    ENCODING_MP3,
+    ENCODING_MULAW,
+    ENCODING_OPUS,
+    ENCODING_SAMPLE_RATES,
+    MP3_BIT_RATES,
+    OPUS_BIT_RATE_MAX,
+    OPUS_BIT_RATE_MIN,
+    PRIORITY_ANNOUNCEMENT,
+    TRANSPORT_WEBSOCKET,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-# No trimming - preserve natural audio transitions for smoother streaming
-TRIM_MS_FROM_END = 0
-SYNTHESIS_DELAY_S = 0.15
 SENTENCE_SEPARATORS = "\n。.，,；;！!？?、"
+MAX_SENTENCE_CHARS = 200
+WEBSOCKET_SAMPLE_RATE = 24000
+# Adaptive chunking: shortest clause sent on its own, and the longest chunk held
+# back while playback is comfortably ahead of synthesis
+MIN_CLAUSE_CHARS = 20
+MAX_ADAPTIVE_CHARS = 400
+# Starting estimates until a voice has been measured
+DEFAULT_TTFB_S = 0.4
+DEFAULT_SECONDS_PER_CHAR = 0.065
+LATENCY_EWMA_ALPHA = 0.3
+# Non-streaming messages longer than this are split and synthesized in parallel
+LONG_FORM_CHUNK_CHARS = 400
+# Deepgram's default bit rates (bps) and sample rates (Hz) per encoding
+DEFAULT_BIT_RATES = {ENCODING_MP3: 48000, ENCODING_OPUS: 12000}
+DEFAULT_SAMPLE_RATES = {ENCODING_LINEAR16: 24000, ENCODING_MULAW: 8000}
+# Output buffering per stream, by duration and bytes, and for all streams of a processor
+STREAM_BUFFER_MAX_SECONDS = 20
+STREAM_BUFFER_MAX_BYTES = 1024 * 1024
+GLOBAL_BUFFER_MAX_BYTES = 8 * 1024 * 1024
+# wav format tag and bits per sample of the raw encodings
+WAV_FORMATS = {ENCODING_LINEAR16: (1, 16), ENCODING_MULAW: (7, 8)}
+
+# Sentence end, unless it follows a digit (list numbers like "1." and decimals like "2.5")
+SENTENCE_END_RE = re.compile(r"(?<!\d)[.!?]")
+WORD_RE = re.compile(r"\w")
 
 def remove_incompatible_characters(text: str) -> str:
     # Deepgram accepts UTF-8, but you can customize if needed
     return text.replace('*', '')
 
+
+class SentenceSegmenter:
+    """
+    Incremental sentence splitter. Each character is scanned once: a cursor is
+    kept across chunks and consumed text is dropped from the buffer lazily.
+    """
+
+    def __init__(self, max_chars: int = MAX_SENTENCE_CHARS) -> None:
+        self.max_chars = max_chars
+        self._buffer = ""
+        # Start of the text not yet emitted, and first position not yet scanned
+        self._start = 0
+        self._scan = 0
+
+    @property
+    def pending(self) -> str:
+        """Return the buffered text that has not been emitted yet."""
+        return self._buffer[self._start:].strip()
+
+    def clear(self) -> None:
+        """Drop the buffered text."""
+        self._buffer = ""
+        self._start = self._scan = 0
+
+    def feed(self, chunk: str) -> list[str]:
+        """Add text and return the speakable sentences it completes."""
+        if self._start > len(self._buffer) // 2:
+            # Compact so the buffer stays proportional to the pending text
+            self._buffer = self._buffer[self._start:]
+            self._scan -= self._start
+            self._start = 0
+        self._buffer += chunk
+        sentences = []
+        while True:
+            match = SENTENCE_END_RE.search(self._buffer, self._scan)
+            if match:
+                end = match.end()
+            elif len(self._buffer) - self._start > self.max_chars:
+                # No sentence end in sight, cut at the last space within reach
+                limit = self._start + self.max_chars
+                end = self._buffer.rfind(" ", self._start + 1, limit + 20)
+                if end == -1:
+                    end = limit
+            else:
+                self._scan = len(self._buffer)
+                return sentences
+            sentence = self._buffer[self._start:end].strip()
+            self._start = self._scan = end
+            if WORD_RE.search(sentence):
+                sentences.append(sentence)
+
+    def flush(self) -> str | None:
+        """Return the remaining text if it is speakable, and reset."""
+        msg = self.pending
+        self.clear()
+        return msg if WORD_RE.search(msg) else None
+
+
+class VoiceLatency:
+    """Smoothed time to first byte and speech rate observed for a voice."""
+
+    def __init__(self) -> None:
+        self.ttfb_s = DEFAULT_TTFB_S
+        self.seconds_per_char = DEFAULT_SECONDS_PER_CHAR
+
+    def record(self, ttfb_s: float, chars: int, audio_s: float) -> None:
+        """Fold one completed request into the averages."""
+        self.ttfb_s += LATENCY_EWMA_ALPHA * (ttfb_s - self.ttfb_s)
+        if chars and audio_s > 0:
+            self.seconds_per_char += LATENCY_EWMA_ALPHA * (audio_s / chars - self.seconds_per_char)
+
+
+class PlaybackClock:
+    """Estimate how far scheduled audio runs ahead of real time in one stream."""
+
+    def __init__(self, latency: VoiceLatency) -> None:
+        self._latency = latency
+        self._ends_at: float | None = None
+
+    def schedule(self, chars: int) -> None:
+        """Account for a chunk of text that was sent for synthesis."""
+        now = time.monotonic()
+        # Playback starts once the first chunk has been synthesized, and stalls
+        # if a later chunk is sent after the previous audio has run out
+        starts_at = max(self._ends_at or 0.0, now + self._latency.ttfb_s)
+        self._ends_at = starts_at + chars * self._latency.seconds_per_char
+
+    def slack_s(self) -> float:
+        """Return how long the next chunk can wait before playback would stall."""
+        if self._ends_at is None:
+            return 0.0
+        # Time left before playback runs dry, minus what the next request needs
+        return self._ends_at - time.monotonic() - self._latency.ttfb_s
+
+    def next_chunk_min_chars(self) -> int:
+        """Return how much text to accumulate before cutting at a clause boundary."""
+        slack = self.slack_s()
+        if slack <= 0:
+            return MIN_CLAUSE_CHARS
+        chars = int(slack / self._latency.seconds_per_char)
+        return max(MIN_CLAUSE_CHARS, min(chars, MAX_ADAPTIVE_CHARS))
+
+
+class AudioFormat:
+    """
+    Output encoding of a synthesis call. Raw encodings (linear16, mulaw) are
+    requested without a container and wrapped in a single wav header, so
+    fragments can be concatenated; opus comes as ogg and mp3 as is.
+    """
+
+    def __init__(
+        self,
+        encoding: str = DEFAULT_ENCODING,
+        sample_rate: int | None = None,
+        bit_rate: int | None = None,
+    ) -> None:
+        self.encoding = encoding
+        self.is_raw = encoding in WAV_FORMATS
+        # Raw audio needs a known rate for the wav header, compressed encodings
+        # have a fixed rate that Deepgram does not take as a parameter
+        self.sample_rate = (sample_rate or DEFAULT_SAMPLE_RATES.get(encoding)) if self.is_raw else None
+        # Deepgram only takes a bit rate for compressed encodings
+        self.bit_rate = None if self.is_raw else bit_rate or None
+
+    def __repr__(self) -> str:
+        return f"AudioFormat({self.encoding!r}, {self.sample_rate!r}, {self.bit_rate!r})"
+
+    @property
+    def extension(self) -> str:
+        """Return the file extension of the produced audio."""
+        if self.is_raw:
+            return "wav"
+        return "ogg" if self.encoding == ENCODING_OPUS else self.encoding
+
+    @property
+    def container(self) -> str | None:
+        """Return the container to request from Deepgram, None for its default."""
+        return "none" if self.is_raw else None
+
+    @property
+    def file_container(self) -> str | None:
+        """Return the container of a complete file, as cached by the entity."""
+        return "wav" if self.is_raw else self.container
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Return the amount of audio data per second of speech."""
+        if self.is_raw:
+            return self.sample_rate * WAV_FORMATS[self.encoding][1] / 8
+        return (self.bit_rate or DEFAULT_BIT_RATES.get(self.encoding, 48000)) / 8
+
+    def request_kwargs(self) -> dict:
+        """Return the format arguments for the API client."""
+        return {
+            "encoding": self.encoding,
+            "sample_rate": self.sample_rate,
+            "bit_rate": self.bit_rate,
+            "container": self.container,
+        }
+
+    def wav_header(self, data_size: int | None = None) -> bytes:
+        """Return a mono wav header, for a stream of unknown length if data_size is None."""
+        format_tag, bits = WAV_FORMATS[self.encoding]
+        block_align = bits // 8
+        # Non-PCM formats carry an (empty) extension size field
+        fmt = struct.pack(
+            "<HHIIHH", format_tag, 1, self.sample_rate, self.sample_rate * block_align, block_align, bits
+        )
+        if format_tag != 1:
+            fmt += struct.pack("<H", 0)
+        if data_size is None:
+            data_size = 0xFFFFFFFF - 12 - 8 - len(fmt) - 8
+        riff_size = min(0xFFFFFFFF, 4 + 8 + len(fmt) + 8 + data_size)
+        return (
+            b"RIFF" + struct.pack("<I", riff_size) + b"WAVE"
+            + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"data" + struct.pack("<I", data_size)
+        )
+
+
+def audio_format_errors(encoding: str, sample_rate: int | None, bit_rate: int | None) -> dict[str, str]:
+    """
+    Return the rate options Deepgram rejects for an encoding, mapped to an
+    error key. Zero or None leaves Deepgram's default and is always accepted.
+    """
+    errors = {}
+    if sample_rate and sample_rate not in ENCODING_SAMPLE_RATES.get(encoding, ()):
+        errors[CONF_SAMPLE_RATE] = "invalid_sample_rate"
+    if bit_rate:
+        if encoding == ENCODING_MP3:
+            supported = bit_rate in MP3_BIT_RATES
+        elif encoding == ENCODING_OPUS:
+            supported = OPUS_BIT_RATE_MIN <= bit_rate <= OPUS_BIT_RATE_MAX
+        else:
+            supported = False
+        if not supported:
+            errors[CONF_BIT_RATE] = "invalid_bit_rate"
+    return errors
+
+
+class AudioMemoryBudget:
+    """
+    Bytes of audio buffered by all streams of a processor, with flow-control
+    metrics. Streams wait here while they are above their watermark or while
+    the total is above max_bytes.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.streams = 0
+        self.pauses = 0
+        self.paused_s = 0.0
+        self._waiters: set[asyncio.Future] = set()
+
+    @property
+    def exceeded(self) -> bool:
+        return self.bytes >= self.max_bytes
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return buffer usage and flow-control counters."""
+        return {
+            "streams": self.streams,
+            "buffered_bytes": self.bytes,
+            "peak_buffered_bytes": self.peak_bytes,
+            "flow_control_pauses": self.pauses,
+            "flow_control_paused_s": round(self.paused_s, 3),
+        }
+
+    def add(self, size: int) -> None:
+        self.bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+
+    def remove(self, size: int) -> None:
+        self.bytes -= size
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def async_wait_for(self, ready: Callable[[], bool]) -> None:
+        """Wait until ready() holds, re-checking whenever audio is consumed."""
+        started = time.monotonic()
+        self.pauses += 1
+        try:
+            while not ready():
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.add(waiter)
+                try:
+                    await waiter
+                finally:
+                    self._waiters.discard(waiter)
+        finally:
+            self.paused_s += time.monotonic() - started
+
+
+class StreamBuffer:
+    """
+    Output queue of one stream, bounded by bytes rather than chunks. The
+    producer calls async_wait_writable before taking on another sentence: above
+    the high watermark it waits until the consumer has drained the buffer to
+    the low watermark. While the processor's total is over budget only streams
+    with nothing buffered may continue, so every stream keeps making progress.
+    """
+
+    def __init__(self, budget: AudioMemoryBudget, high_bytes: int) -> None:
+        self._budget = budget
+        self._high_bytes = high_bytes
+        self._low_bytes = high_bytes // 2
+        self._queue: deque[bytes | None] = deque()
+        self._readable = asyncio.Event()
+        self._closed = False
+        self.bytes = 0
+        budget.streams += 1
+
+    def put_nowait(self, chunk: bytes | None) -> None:
+        """Queue a chunk, None marks the end of the stream."""
+        if self._closed:
+            return
+        self._queue.append(chunk)
+        if chunk:
+            self.bytes += len(chunk)
+            self._budget.add(len(chunk))
+        self._readable.set()
+
+    async def get(self) -> bytes | None:
+        while not self._queue:
+            self._readable.clear()
+            await self._readable.wait()
+        chunk = self._queue.popleft()
+        if chunk:
+            self.bytes -= len(chunk)
+            self._budget.remove(len(chunk))
+        return chunk
+
+    def _writable(self, limit: int) -> bool:
+        return self.bytes <= limit and (not self._budget.exceeded or not self.bytes)
+
+    async def async_wait_writable(self) -> None:
+        """Wait while the consumer lags behind, see the class docstring."""
+        if self.bytes < self._high_bytes and self._writable(self._high_bytes):
+            return
+        await self._budget.async_wait_for(lambda: self._writable(self._low_bytes))
+
+    def close(self) -> None:
+        """Release whatever the consumer left unread and drop later chunks."""
+        if self._closed:
+            return
+        self._closed = True
+        self._budget.remove(self.bytes)
+        self._budget.streams -= 1
+        self.bytes = 0
+        self._queue.clear()
+
+
+def assemble_audio(audio_format: AudioFormat, fragments: list[bytes], process: bool) -> bytes:
+    """
+    Join synthesized fragments into a single file, trimming and normalizing PCM
+    first if process is set. CPU-bound, runs on the audio executor.
+    """
+    if process:
+        fragments = [process_pcm(fragment, audio_format.sample_rate) for fragment in fragments]
+    if audio_format.is_raw:
+        data = b"".join(fragments)
+        return audio_format.wav_header(len(data)) + data
+    if audio_format.encoding == ENCODING_MP3:
+        return join_mp3(fragments)
+    # Ogg streams can be chained back to back
+    return b"".join(fragments)
+
+
 class DeepgramStreamProcessor:
-    def __init__(self, client: object) -> None:
+    def __init__(
+        self,
+        client: object,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: DeepgramAudioCache | None = None,
+        transport: str = DEFAULT_TRANSPORT,
+        pcm_processing: bool = DEFAULT_PCM_PROCESSING,
+        executor: AudioExecutor | None = None,
+        metrics: LatencyMetrics | None = None,
+    ) -> None:
         self._client = client
+        # Pool for CPU-bound audio work, the event loop only relays bytes
+        self._executor = executor or AudioExecutor()
+        # "rest" posts one request per sentence, "websocket" keeps one session per stream
+        self._transport = transport
+        # Sentence-level audio cache, keyed per voice
+        self._cache = cache
+        # Number of sentence requests allowed in flight at the same time
+        self._max_concurrency = max(1, max_concurrency)
+        # Trim silence and even out loudness of linear16 sentences with numpy
+        if pcm_processing and not NUMPY_AVAILABLE:
+            _LOGGER.warning("numpy is not available, PCM silence trimming and normalization are disabled")
+            pcm_processing = False
+        self._pcm_processing = pcm_processing
+        # Observed latency per voice, drives adaptive chunk sizing
+        self._latency: dict[str, VoiceLatency] = {}
+        # Audio buffered for consumers across all streams
+        self._buffer_budget = AudioMemoryBudget(GLOBAL_BUFFER_MAX_BYTES)
+        # Stage latency histograms, None skips all timing
+        self._metrics = metrics
+
+    @property
+    def buffer_stats(self) -> dict[str, Any]:
+        """Return output buffer usage and flow-control counters of all streams."""
+        return self._buffer_budget.stats
+
+    @property
+    def latency_stats(self) -> dict[str, Any]:
+        """Return the smoothed latency per voice used for adaptive chunking."""
+        return {
+            model: {"ttfb_s": round(latency.ttfb_s, 3), "seconds_per_char": round(latency.seconds_per_char, 4)}
+            for model, latency in self._latency.items()
+        }
+
+    def output_format(self, audio_format: AudioFormat | None = None) -> AudioFormat:
+        """
+        Return the format async_process_stream produces for a requested format.
+        The WebSocket transport only streams raw audio and falls back to linear16.
+        """
+        audio_format = audio_format or AudioFormat()
+        if self._transport == TRANSPORT_WEBSOCKET and not audio_format.is_raw:
+            return AudioFormat(ENCODING_LINEAR16, WEBSOCKET_SAMPLE_RATE)
+        return audio_format
 
     async def _preprocess_stream(self, text_stream: AsyncIterable[str]) -> AsyncIterable[str]:
         """Clean text by removing incompatible characters and custom markers."""
@@ -32,175 +467,380 @@ class DeepgramStreamProcessor:
             cleaned = remove_incompatible_characters(chunk)
             yield cleaned
 
-    def _find_sentence(self, buffer_text: str) -> tuple[str, str]:
+    def _voice_latency(self, model: str) -> VoiceLatency:
+        if (latency := self._latency.get(model)) is None:
+            latency = self._latency[model] = VoiceLatency()
+        return latency
+
+    async def _sentence_generator(
+        self, text_stream: AsyncIterable[str], model: str = ""
+    ) -> AsyncGenerator[str, None]:
         """
-        Extract the first complete sentence from the buffer using a language-agnostic
-        approach for decimal points.
+        Yield speakable chunks from a text stream. Clauses are cut early while
+        playback has little audio buffered; while it is ahead of synthesis, chunks
+        grow and consecutive short sentences are packed into a single request.
         """
-        if not buffer_text:
-            return "", ""
-
-        DECIMAL_PLACEHOLDER = "##DEC##"
-        safe_text = re.sub(r'(\d)\.(\d)', fr'\1{DECIMAL_PLACEHOLDER}\2', buffer_text)
-
-        # Only split if the dot is not part of a list number (e.g., "1.", "2.", etc.)
-        match = re.search(r"(?<!\d)[.!?]", safe_text)
-        if match:
-            end_index = match.start() + 1
-            sentence_part = safe_text[:end_index]
-            rest_part = safe_text[end_index:]
-            final_sentence = sentence_part.replace(DECIMAL_PLACEHOLDER, '.')
-            final_rest = rest_part.replace(DECIMAL_PLACEHOLDER, '.')
-            return final_sentence.strip(), final_rest.strip()
-
-        max_chars = 200
-        if len(safe_text) > max_chars:
-            search_area = safe_text[:max_chars + 20]
-            last_space_index = search_area.rfind(" ")
-            if last_space_index > 0:
-                sentence_part = safe_text[:last_space_index]
-                rest_part = safe_text[last_space_index:]
-            else:
-                sentence_part = safe_text[:max_chars]
-                rest_part = safe_text[max_chars:]
-            final_sentence = sentence_part.replace(DECIMAL_PLACEHOLDER, '.')
-            final_rest = rest_part.replace(DECIMAL_PLACEHOLDER, '.')
-            return final_sentence.strip(), final_rest.strip()
-
-        return "", buffer_text
-
-    async def _sentence_generator(self, text_stream: AsyncIterable[str]) -> AsyncGenerator[str, None]:
-        """Yield complete, speakable sentences from a text stream using smart buffering."""
-        buffer = ""
+        segmenter = SentenceSegmenter()
+        clock = PlaybackClock(self._voice_latency(model))
+        # Short sentences waiting to be packed into a single request
+        packed: list[str] = []
         generated_sentences = 0
-        count = 0
-        async for chunk in text_stream:
-            _LOGGER.debug("Streaming tts sentence: %s", chunk)
-            count += 1
-            min_len = 2 ** count * 10  # Exponential buffer growth for optimal streaming
-            buffer += chunk
+        text_arrived = False
+        metrics = self._metrics
+        started = time.monotonic()
+        # Arrival of the oldest text not yet sent, timed only with metrics on
+        text_at: float | None = None
 
-            # Try to find complete sentences first
+        def take_packed(min_chars: int | None = None) -> str:
+            """Pop sentences from the pack until min_chars is reached (all if None)."""
+            nonlocal generated_sentences, text_at
+            count = len(packed)
+            if min_chars is not None:
+                size = 0
+                for count, sentence in enumerate(packed, 1):
+                    size += len(sentence)
+                    if size >= min_chars:
+                        break
+            text = " ".join(packed[:count])
+            del packed[:count]
+            generated_sentences += 1
+            clock.schedule(len(text))
+            if text_at is not None:
+                now = time.monotonic()
+                metrics.record(model, STAGE_SEGMENTATION, now - text_at)
+                # Text left over has been waiting since at least now
+                text_at = now if packed or segmenter.pending else None
+            return text
+
+        chunks = aiter(text_stream)
+        next_chunk: asyncio.Future | None = None
+        try:
             while True:
-                sentence, rest = self._find_sentence(buffer)
-                if sentence:
-                    if re.search(r'\w', sentence):
-                        generated_sentences += 1
-                        yield sentence
-                    buffer = rest
-                else:
+                if next_chunk is None:
+                    next_chunk = asyncio.ensure_future(anext(chunks, None))
+                if packed:
+                    # Hold packed text only as long as playback has slack
+                    done, _ = await asyncio.wait({next_chunk}, timeout=max(clock.slack_s(), 0))
+                    if not done:
+                        yield take_packed()
+                        continue
+                chunk = await next_chunk
+                next_chunk = None
+                if chunk is None:
                     break
+                if metrics is not None and text_at is None:
+                    text_at = time.monotonic()
+                    if not text_arrived:
+                        metrics.record(model, STAGE_TEXT_ARRIVAL, text_at - started)
+                text_arrived = True
+                _LOGGER.debug("Streaming tts chunk: %s", chunk)
+                min_len = clock.next_chunk_min_chars()
+                segmenter.max_chars = max(MAX_SENTENCE_CHARS, min_len)
 
-            # If buffer is long enough and ends with separator, yield it
-            msg = buffer.strip()
-            if len(msg) >= min_len:
-                # Check if buffer ends with a sentence separator
-                if msg and msg[-1] in SENTENCE_SEPARATORS:
-                    generated_sentences += 1
-                    yield msg
-                    buffer = ""
+                # Try to find complete sentences first
+                packed.extend(segmenter.feed(chunk))
+
+                # If buffer is long enough and ends with separator, take it too
+                msg = segmenter.pending
+                if len(msg) >= min_len and msg[-1] in SENTENCE_SEPARATORS:
+                    segmenter.clear()
+                    packed.append(msg)
+
+                # Send once the pack is big enough or playback needs audio now
+                while packed:
+                    target = min(clock.next_chunk_min_chars(), MAX_SENTENCE_CHARS)
+                    if sum(map(len, packed)) < target and clock.slack_s() > 0:
+                        break
+                    yield take_packed(target)
+        finally:
+            if next_chunk is not None:
+                # Stop reading the text stream before going away
+                next_chunk.cancel()
+                await asyncio.gather(next_chunk, return_exceptions=True)
 
         # Yield any remaining content in buffer
-        if msg := buffer.strip():
-            if re.search(r'\w', msg):
-                generated_sentences += 1
-                yield msg
+        if msg := segmenter.flush():
+            packed.append(msg)
+        if packed:
+            yield take_packed()
 
         if generated_sentences == 0:
             _LOGGER.warning("No sentence was generated for synthesis from the received text.")
 
-    def _trim_end_of_audio(self, audio_data: bytes) -> bytes:
-        """
-        Use pydub to trim TRIM_MS_FROM_END ms from the end of each mp3 fragment.
-        Preserves audio quality while removing unnecessary silence.
-        """
-        if not AudioSegment:
-            return audio_data
-        try:
-            segment = AudioSegment.from_file(io.BytesIO(audio_data), format="mp3")
-            if len(segment) > TRIM_MS_FROM_END:
-                trimmed = segment[:-TRIM_MS_FROM_END]
-                out_buffer = io.BytesIO()
-                trimmed.export(out_buffer, format="mp3")
-                return out_buffer.getvalue()
-            else:
-                out_buffer = io.BytesIO()
-                segment.export(out_buffer, format="mp3")
-                return out_buffer.getvalue()
-        except Exception as e:
-            _LOGGER.warning("Could not trim end of audio, returning original. Error: %s", e)
-            return audio_data
-
-    def _strip_id3(self, mp3_bytes: bytes) -> bytes:
-        """Remove ID3v2 headers from an mp3 fragment (except the first one)."""
-        if mp3_bytes[:3] == b"ID3":
-            # ID3v2 header is 10 bytes + size
-            size = int.from_bytes(mp3_bytes[6:10], "big")
-            return mp3_bytes[10+size:]
-        return mp3_bytes
-
     async def async_process_stream(
-        self, text_stream: AsyncIterable[str], model: str
+        self,
+        text_stream: AsyncIterable[str],
+        model: str,
+        audio_format: AudioFormat | None = None,
     ) -> AsyncIterable[bytes]:
         """
-        Process the text into sentences, synthesize each one, trim the end and buffer them.
-        Each fragment is yielded as a valid mp3 for streaming.
+        Process the text into sentences, synthesize each one and buffer them.
+        Audio is yielded as it arrives from Deepgram and forms a single stream
+        in output_format(audio_format). When the consumer stops early, reading
+        text and all outstanding requests are aborted before the generator
+        closes.
         """
-        if not AudioSegment:
-            raise RuntimeError("pydub is not available to join mp3 fragments")
+        audio_format = self.output_format(audio_format)
+        if self._transport == TRANSPORT_WEBSOCKET:
+            async with aclosing(self._process_websocket(text_stream, model, audio_format)) as stream:
+                async for chunk in stream:
+                    yield chunk
+            return
 
-        output_queue = asyncio.Queue(maxsize=10)
+        output_queue = StreamBuffer(
+            self._buffer_budget,
+            min(STREAM_BUFFER_MAX_BYTES, int(STREAM_BUFFER_MAX_SECONDS * audio_format.bytes_per_second)),
+        )
         processing_task = asyncio.create_task(
-            self._process_all_text(text_stream, output_queue, model)
+            self._process_all_text(text_stream, output_queue, model, audio_format)
         )
 
+        started = time.monotonic()
+        # Raw formats start with the wav header, which is queued before any audio
+        first_audio = 1 if audio_format.is_raw else 0
         idx = 0
-        while True:
-            try:
-                chunk = await output_queue.get()
-                if chunk is None:
-                    break
-                try:
-                    segment = AudioSegment.from_file(io.BytesIO(chunk), format="mp3")
-                    out_buffer = io.BytesIO()
-                    await asyncio.to_thread(segment.export, out_buffer, format="mp3")
-                    mp3_bytes = out_buffer.getvalue()
-                    yield mp3_bytes
-                except Exception as e:
-                    _LOGGER.error("Error decoding mp3 chunk #%d: %s", idx, e)
-                output_queue.task_done()
+        try:
+            while (chunk := await output_queue.get()) is not None:
+                if idx == first_audio:
+                    self._record_first_audio(model, started)
+                yield chunk
                 idx += 1
-            except asyncio.CancelledError:
-                break
-
-        if not processing_task.done():
+            # Surface errors that ended the stream early
+            await processing_task
+        finally:
+            # Consumer went away or was cancelled: drop buffered audio and wait
+            # until no request is left in flight
+            output_queue.close()
             processing_task.cancel()
-            await asyncio.sleep(0)
+            await asyncio.gather(processing_task, return_exceptions=True)
+
+    def _split_long_form(self, text: str) -> list[str]:
+        """Split a message into sentence-aligned pieces of about LONG_FORM_CHUNK_CHARS."""
+        segmenter = SentenceSegmenter()
+        sentences = segmenter.feed(remove_incompatible_characters(text))
+        if msg := segmenter.flush():
+            sentences.append(msg)
+        pieces: list[str] = []
+        for sentence in sentences:
+            if pieces and len(pieces[-1]) + len(sentence) < LONG_FORM_CHUNK_CHARS:
+                pieces[-1] += " " + sentence
+            else:
+                pieces.append(sentence)
+        return pieces
+
+    async def async_synthesize_long_form(
+        self,
+        text: str,
+        model: str,
+        priority: int = PRIORITY_ANNOUNCEMENT,
+        audio_format: AudioFormat | None = None,
+    ) -> bytes:
+        """
+        Synthesize a complete message as one file in audio_format (mp3 by default).
+        Long messages are split at sentence boundaries, synthesized with up to
+        max_concurrency requests in flight and joined in order.
+        """
+        audio_format = audio_format or AudioFormat()
+        request_kwargs = audio_format.request_kwargs()
+        pieces = self._split_long_form(text) if len(text) > LONG_FORM_CHUNK_CHARS else [text]
+        if len(pieces) <= 1:
+            audio = await self._client.async_synthesize_speech(
+                text=text, model=model, priority=priority, **request_kwargs
+            )
+            return await self._executor.async_run(
+                assemble_audio, audio_format, [audio], self._processes_pcm(audio_format)
+            )
+
+        window = asyncio.Semaphore(self._max_concurrency)
+
+        async def synthesize(piece: str) -> bytes:
+            async with window:
+                return await self._client.async_synthesize_speech(
+                    text=piece, model=model, priority=priority, **request_kwargs
+                )
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(synthesize(piece)) for piece in pieces]
+        except ExceptionGroup as err:
+            # Remaining pieces were cancelled, report the first failure like a single request
+            raise err.exceptions[0] from None
+        return await self._executor.async_run(
+            assemble_audio,
+            audio_format,
+            [task.result() for task in tasks],
+            self._processes_pcm(audio_format),
+        )
+
+    def _processes_pcm(self, audio_format: AudioFormat) -> bool:
+        return self._pcm_processing and audio_format.encoding == ENCODING_LINEAR16
+
+    async def _process_websocket(
+        self, text_stream: AsyncIterable[str], model: str, audio_format: AudioFormat
+    ) -> AsyncIterable[bytes]:
+        """Synthesize the whole stream over one Deepgram WebSocket session."""
+        started = time.monotonic()
+        sentences = self._sentence_generator(self._preprocess_stream(text_stream), model)
+        first = True
+        async with aclosing(sentences), aclosing(
+            self._client.async_stream_speech_websocket(
+                sentences,
+                model=model,
+                encoding=audio_format.encoding,
+                sample_rate=audio_format.sample_rate,
+            )
+        ) as stream:
+            async for chunk in stream:
+                if first:
+                    self._record_first_audio(model, started)
+                    yield audio_format.wav_header()
+                    first = False
+                yield chunk
+
+    def _record_first_audio(self, model: str, started: float) -> None:
+        elapsed = time.monotonic() - started
+        _LOGGER.debug("Time to first audio: %.3f s", elapsed)
+        if self._metrics is not None:
+            self._metrics.record(model, STAGE_FIRST_AUDIO, elapsed)
+
+    def _sentence_cache_key(self, sentence: str, model: str, audio_format: AudioFormat) -> str | None:
+        """Return the cache key of a sentence fragment, None when caching is off."""
+        if not self._cache:
+            return None
+        return self._cache.make_key(
+            sentence, model, audio_format.encoding, audio_format.sample_rate,
+            audio_format.bit_rate, audio_format.container,
+        )
+
+    async def _synthesize_sentence(
+        self,
+        sentence: str,
+        model: str,
+        sink: asyncio.Queue,
+        audio_format: AudioFormat,
+        queued_at: float,
+    ) -> None:
+        """Synthesize a single sentence into sink, terminated by None."""
+        started = sent_at = time.monotonic()
+        cache_key = self._sentence_cache_key(sentence, model, audio_format)
+        request_kwargs = audio_format.request_kwargs()
+        if self._metrics is not None:
+
+            def on_request_sent() -> None:
+                nonlocal sent_at
+                sent_at = time.monotonic()
+
+            request_kwargs["on_request_sent"] = on_request_sent
+        try:
+            # Processed PCM needs the whole sentence, everything else is relayed as it arrives
+            process = self._processes_pcm(audio_format)
+            chunks = []
+            first_at = None
+            async for chunk in self._client.async_stream_speech(
+                text=sentence,
+                model=model,
+                **request_kwargs,
+            ):
+                if first_at is None:
+                    first_at = time.monotonic()
+                if not process:
+                    sink.put_nowait(chunk)
+                chunks.append(chunk)
+            if first_at is not None and self._metrics is not None:
+                self._metrics.record(model, STAGE_REQUEST_QUEUE, sent_at - queued_at)
+                self._metrics.record(model, STAGE_HTTP_TTFB, first_at - sent_at)
+                self._metrics.record(model, STAGE_BODY, time.monotonic() - first_at)
+            if process and chunks:
+                sink.put_nowait(
+                    await self._executor.async_run(process_pcm, b"".join(chunks), audio_format.sample_rate)
+                )
+            if first_at is not None:
+                size = sum(len(chunk) for chunk in chunks)
+                self._voice_latency(model).record(
+                    first_at - started, len(sentence), size / audio_format.bytes_per_second
+                )
+            if self._cache and chunks:
+                await self._cache.async_put(cache_key, b"".join(chunks))
+        finally:
+            sink.put_nowait(None)
 
     async def _process_all_text(
-        self, text_stream: AsyncIterable[str], output_queue: asyncio.Queue, model: str
+        self,
+        text_stream: AsyncIterable[str],
+        output_queue: StreamBuffer,
+        model: str,
+        audio_format: AudioFormat,
     ):
-        try:
-            sentences_generator = self._sentence_generator(self._preprocess_stream(text_stream))
-            async for sentence in sentences_generator:
-                await asyncio.sleep(SYNTHESIS_DELAY_S)
+        """
+        Synthesize sentences with up to max_concurrency requests in flight.
+        Audio is delivered to output_queue in sentence order, chunk by chunk.
+        """
+        window = asyncio.Semaphore(self._max_concurrency)
+        pending: asyncio.Queue = asyncio.Queue()
+        in_flight: set[asyncio.Task] = set()
+
+        async def deliver() -> None:
+            if audio_format.is_raw:
+                # Raw fragments follow a single streaming wav header
+                output_queue.put_nowait(audio_format.wav_header())
+            while (item := await pending.get()) is not None:
+                sentence, task, sink = item
+                # mp3 fragments are reduced to bare audio frames so they join gaplessly
+                frames = Mp3FrameFilter() if audio_format.encoding == ENCODING_MP3 else None
+                received = 0
                 try:
-                    audio_bytes = await self._client.async_synthesize_speech(
-                        text=sentence,
-                        model=model,
-                        encoding="mp3",
-                    )
-                    if not audio_bytes:
+                    while (chunk := await sink.get()) is not None:
+                        received += len(chunk)
+                        if frames is not None and not (chunk := frames.feed(chunk)):
+                            continue
+                        output_queue.put_nowait(chunk)
+                    if task is not None:
+                        await task
+                    if not received:
                         _LOGGER.error("Deepgram returned empty audio for sentence: '%s'", sentence)
-                        continue
-                    # Skip trimming when TRIM_MS_FROM_END is 0 for optimal performance
-                    if TRIM_MS_FROM_END > 0:
-                        trimmed_mp3 = await asyncio.to_thread(self._trim_end_of_audio, audio_bytes)
-                        if trimmed_mp3:
-                            await output_queue.put(trimmed_mp3)
-                    else:
-                        await output_queue.put(audio_bytes)
                 except Exception as e:
                     _LOGGER.error("Error processing sentence '%s': %s", sentence[:30], e, exc_info=True)
+                finally:
+                    if task is not None:
+                        in_flight.discard(task)
+                        window.release()
+
+        delivery_task = asyncio.create_task(deliver())
+        sentences_generator = self._sentence_generator(self._preprocess_stream(text_stream), model)
+        try:
+            while True:
+                # Stop segmenting and synthesizing while the consumer lags behind
+                await output_queue.async_wait_writable()
+                if (sentence := await anext(sentences_generator, None)) is None:
+                    break
+                queued_at = time.monotonic()
+                sink: asyncio.Queue = asyncio.Queue()
+                if self._cache and (
+                    cached := await self._cache.async_get(
+                        self._sentence_cache_key(sentence, model, audio_format)
+                    )
+                ):
+                    # Cache hit: splice the audio in without an API round-trip
+                    if self._processes_pcm(audio_format):
+                        cached = await self._executor.async_run(process_pcm, cached, audio_format.sample_rate)
+                    sink.put_nowait(cached)
+                    sink.put_nowait(None)
+                    pending.put_nowait((sentence, None, sink))
+                    continue
+                await window.acquire()
+                task = asyncio.create_task(
+                    self._synthesize_sentence(sentence, model, sink, audio_format, queued_at)
+                )
+                in_flight.add(task)
+                pending.put_nowait((sentence, task, sink))
+            pending.put_nowait(None)
+            await delivery_task
         finally:
-            await output_queue.put(None)
+            # Consumer went away or an error occurred: abort pending requests
+            # and stop reading text before reporting the end of the stream
+            delivery_task.cancel()
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(delivery_task, *in_flight, return_exceptions=True)
+            await sentences_generator.aclose()
+            output_queue.put_nowait(None)
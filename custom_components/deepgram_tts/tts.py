@@ -9,7 +9,10 @@ from typing import AsyncGenerator
 
 # (chunk_text eliminado, usar solo el chunking de stream_processor.py)
 
+import voluptuous as vol
+
 from homeassistant.components.tts import (
+    ATTR_MESSAGE,
     ATTR_VOICE,
     TextToSpeechEntity,
     Voice,
@@ -18,11 +21,25 @@ from homeassistant.components.tts import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api import DeepgramTTSApiClient
-from .const import DOMAIN
-from .stream_processor import DeepgramStreamProcessor
+from .cache import DeepgramAudioCache
+from .catalog import DeepgramModelsUpdater
+from .const import (
+    CONF_BIT_RATE,
+    CONF_ENCODING,
+    CONF_SAMPLE_RATE,
+    DEFAULT_BIT_RATE,
+    DEFAULT_ENCODING,
+    DEFAULT_SAMPLE_RATE,
+    DOMAIN,
+    ENCODINGS,
+    PRIORITY_BACKGROUND,
+    SERVICE_PREFETCH,
+)
+from .stream_processor import AudioFormat, DeepgramStreamProcessor, audio_format_errors
 
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 
@@ -36,7 +53,19 @@ async def async_setup_entry(
     """Set up Deepgram TTS platform."""
     client = hass.data[DOMAIN][config_entry.entry_id]["client"]
     processor = hass.data[DOMAIN][config_entry.entry_id]["processor"]
-    async_add_entities([DeepgramTtsEntity(config_entry, client, processor)])
+    cache = hass.data[DOMAIN][config_entry.entry_id]["cache"]
+    models = hass.data[DOMAIN][config_entry.entry_id]["models"]
+    async_add_entities([DeepgramTtsEntity(config_entry, client, processor, cache, models)])
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_PREFETCH,
+        {
+            vol.Required(ATTR_MESSAGE): cv.string,
+            vol.Optional(ATTR_VOICE): cv.string,
+        },
+        "async_prefetch",
+    )
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Deepgram TTS platform."""
@@ -45,11 +74,20 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 class DeepgramTtsEntity(TextToSpeechEntity):
     """Representation of a Deepgram TTS entity."""
 
-    def __init__(self, config_entry: ConfigEntry, client: DeepgramTTSApiClient, processor: DeepgramStreamProcessor) -> None:
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        client: DeepgramTTSApiClient,
+        processor: DeepgramStreamProcessor,
+        cache: DeepgramAudioCache,
+        models: DeepgramModelsUpdater,
+    ) -> None:
         """Initialize the Deepgram TTS entity."""
         self._config_entry = config_entry
         self._client = client
         self._processor = processor
+        self._cache = cache
+        self._models = models
         self._attr_name = "Deepgram TTS"
         self._attr_unique_id = config_entry.entry_id
 
@@ -67,18 +105,26 @@ class DeepgramTtsEntity(TextToSpeechEntity):
     @property
     def supported_languages(self) -> list[str]:
         """Return list of supported languages (idiomas base únicos de los modelos)."""
-        models = getattr(self._client, "_models_cache", [])
-        languages = set()
-        for model in models:
-            for lang in model.get("languages", []):
-                base = lang.split("_")[0]
-                languages.add(base)
-        return sorted(languages) if languages else [self.default_language]
+        languages = self._models.catalog.languages
+        return languages if languages else [self.default_language]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return audio cache and output buffer counters."""
+        stats = self._cache.stats
+        buffer_stats = self._processor.buffer_stats
+        return {
+            "cache_hits": stats["memory_hits"] + stats["disk_hits"],
+            "cache_misses": stats["misses"],
+            "buffered_bytes": buffer_stats["buffered_bytes"],
+            "peak_buffered_bytes": buffer_stats["peak_buffered_bytes"],
+            "flow_control_pauses": buffer_stats["flow_control_pauses"],
+        }
 
     @property
     def supported_options(self) -> list[str]:
         """Return a list of supported options."""
-        return [ATTR_VOICE]
+        return [ATTR_VOICE, CONF_ENCODING, CONF_SAMPLE_RATE, CONF_BIT_RATE]
 
     @property
     def default_options(self) -> dict[str, Any]:
@@ -87,20 +133,45 @@ class DeepgramTtsEntity(TextToSpeechEntity):
         # Ensure voice is not empty
         if not voice or voice.strip() == "":
             voice = "aura-2-thalia-en"
+        # The entry's rates are left out: Home Assistant merges the defaults into
+        # every call's options, and they only apply to the entry's own encoding
         return {
-            ATTR_VOICE: voice
+            ATTR_VOICE: voice,
+            CONF_ENCODING: self._config_entry.options.get(CONF_ENCODING, DEFAULT_ENCODING),
         }
 
+    def _audio_format(self, options: dict[str, Any] | None) -> AudioFormat:
+        """Return the output format from call options, falling back to the entry's."""
+        entry_options = self._config_entry.options
+        options = options or {}
+        encoding = options.get(CONF_ENCODING, entry_options.get(CONF_ENCODING, DEFAULT_ENCODING))
+        if encoding not in ENCODINGS:
+            raise ServiceValidationError(
+                f"Unsupported encoding '{encoding}', expected one of {', '.join(ENCODINGS)}"
+            )
+        if encoding == entry_options.get(CONF_ENCODING, DEFAULT_ENCODING):
+            default_sample_rate = entry_options.get(CONF_SAMPLE_RATE, DEFAULT_SAMPLE_RATE)
+            default_bit_rate = entry_options.get(CONF_BIT_RATE, DEFAULT_BIT_RATE)
+        else:
+            # The entry's rates belong to its own encoding
+            default_sample_rate, default_bit_rate = DEFAULT_SAMPLE_RATE, DEFAULT_BIT_RATE
+        try:
+            sample_rate = int(options.get(CONF_SAMPLE_RATE, default_sample_rate) or 0)
+            bit_rate = int(options.get(CONF_BIT_RATE, default_bit_rate) or 0)
+        except (TypeError, ValueError) as exc:
+            raise ServiceValidationError(f"Invalid sample rate or bit rate: {exc}") from exc
+        if errors := audio_format_errors(encoding, sample_rate, bit_rate):
+            rejected = " and ".join(key.replace("_", " ") for key in errors)
+            raise ServiceValidationError(
+                f"Unsupported {rejected} for {encoding} (sample_rate={sample_rate}, bit_rate={bit_rate})"
+            )
+        return AudioFormat(encoding, sample_rate, bit_rate)
+
     @callback
     def async_get_supported_voices(self, language: str) -> list[Voice] | None:
         """Return a list of supported voices for a language base."""
-        models = getattr(self._client, "_models_cache", [])
-        voices = []
-        _LOGGER.debug(f"async_get_supported_voices: received language={language}")
-        for model in models:
-            if any(lang.split("_")[0] == language for lang in model.get("languages", [])):
-                voices.append(Voice(model["canonical_name"], model["name"]))
-        _LOGGER.debug(f"async_get_supported_voices: returning {len(voices)} voices for {language}: {[v.name for v in voices]}")
+        voices = self._models.catalog.voices_for_language(language)
+        _LOGGER.debug("async_get_supported_voices: returning %d voices for %s", len(voices), language)
         return voices if voices else None
 
     async def async_get_tts_audio(
@@ -126,29 +197,51 @@ class DeepgramTtsEntity(TextToSpeechEntity):
         )
         # If voice is not set, try to find a voice matching the language
         if not voice and language_opt:
-            for model in self._processor._client._models_cache or []:
-                if language_opt in model.get("languages", []):
-                    voice = model.get("canonical_name")
-                    break
+            voice = self._models.catalog.voice_for_language(language_opt)
         if not voice:
             raise ServiceValidationError("No valid voice found for the requested language or configuration.")
 
+        audio_format = self._audio_format(options)
+        cache_key = self._message_cache_key(message, voice, audio_format)
+        if (audio_bytes := await self._cache.async_get(cache_key)) is not None:
+            return audio_format.extension, audio_bytes
+
         try:
-            audio_bytes = await self._client.async_synthesize_speech(
-                text=message,
-                model=voice,
+            audio_bytes = await self._processor.async_synthesize_long_form(
+                message, voice, audio_format=audio_format
             )
-            return "mp3", audio_bytes
+            await self._cache.async_put(cache_key, audio_bytes)
+            return audio_format.extension, audio_bytes
         except Exception as exc:
             _LOGGER.error("Error in Deepgram TTS synthesis: %s", exc)
             raise HomeAssistantError(f"Failed to synthesize speech with Deepgram: {exc}") from exc
 
+    def _message_cache_key(self, message: str, voice: str, audio_format: AudioFormat) -> str:
+        """Return the cache key of a complete message file."""
+        return self._cache.make_key(
+            message, voice, audio_format.encoding, audio_format.sample_rate,
+            audio_format.bit_rate, audio_format.file_container,
+        )
+
+    async def async_prefetch(self, message: str, voice: str | None = None) -> None:
+        """Synthesize a message into the audio cache at background priority."""
+        voice = voice or self.default_options[ATTR_VOICE]
+        audio_format = self._audio_format(None)
+        cache_key = self._message_cache_key(message, voice, audio_format)
+        if await self._cache.async_get(cache_key) is not None:
+            return
+        try:
+            audio_bytes = await self._processor.async_synthesize_long_form(
+                message, voice, priority=PRIORITY_BACKGROUND, audio_format=audio_format
+            )
+        except Exception as exc:
+            raise HomeAssistantError(f"Failed to prefetch speech with Deepgram: {exc}") from exc
+        await self._cache.async_put(cache_key, audio_bytes)
+
     async def async_stream_tts_audio(self, request: TTSAudioRequest) -> TTSAudioResponse:
         """Stream TTS audio for a message."""
         # Use the same voice selection logic as non-streaming TTS
         _LOGGER.debug(f"Streaming TTS request options: {request.options}")
-        _LOGGER.debug(f"Config entry options: {self._config_entry.options}")
-        _LOGGER.debug(f"Config entry data: {self._config_entry.data}")
 
         voice = (
             request.options.get(ATTR_VOICE)
@@ -163,12 +256,17 @@ class DeepgramTtsEntity(TextToSpeechEntity):
             _LOGGER.debug(f"Voice was empty, using default: {voice}")
 
         async def message_gen() -> AsyncGenerator[str, None]:
-            texto = ""
+            # Forward chunks as they arrive so the first sentence can be
+            # synthesized while the LLM is still generating the rest.
+            received = 0
             if hasattr(request, "message_gen") and request.message_gen is not None:
                 async for chunk in request.message_gen:
-                    texto += chunk
-            _LOGGER.debug("Text reconstructed from request.message_gen: '%s' (length=%d)", texto, len(texto))
-            yield texto
+                    received += len(chunk)
+                    yield chunk
+            _LOGGER.debug("Forwarded %d characters from request.message_gen", received)
 
-        audio_generator = self._processor.async_process_stream(message_gen(), model=voice)
-        return TTSAudioResponse(extension="mp3", data_gen=audio_generator)
+        audio_format = self._processor.output_format(self._audio_format(request.options))
+        audio_generator = self._processor.async_process_stream(
+            message_gen(), model=voice, audio_format=audio_format
+        )
+        return TTSAudioResponse(extension=audio_format.extension, data_gen=audio_generator)
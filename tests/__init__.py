@@ -0,0 +1 @@
+"""Tests for the Deepgram TTS integration."""
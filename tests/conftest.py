@@ -0,0 +1,54 @@
+"""Fixtures for Deepgram TTS tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+
+from custom_components.deepgram_tts.api import DeepgramTTSApiClient
+from custom_components.deepgram_tts.const import RATE_LIMIT_MAX_CONCURRENT
+from custom_components.deepgram_tts.limiter import DeepgramRateLimiter
+
+from .stand_in_server import StandInDeepgram
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable custom integrations in all tests."""
+    yield
+
+
+@pytest.fixture
+def stand_in() -> StandInDeepgram:
+    """Return the behaviour and request log of the stand-in server."""
+    return StandInDeepgram()
+
+
+@pytest.fixture
+async def stand_in_server(
+    stand_in: StandInDeepgram, socket_enabled: None
+) -> AsyncGenerator[TestServer]:
+    """Serve the stand-in on a local port."""
+    server = TestServer(stand_in.make_app())
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def client(stand_in_server: TestServer) -> AsyncGenerator[DeepgramTTSApiClient]:
+    """Return an API client talking to the stand-in server."""
+    async with aiohttp.ClientSession() as session:
+        client = DeepgramTTSApiClient(
+            "test-key",
+            session,
+            max_retries=0,
+            # Not the process-wide limiter, so tests do not share slots
+            limiter=DeepgramRateLimiter(RATE_LIMIT_MAX_CONCURRENT, 500, 5000),
+        )
+        client._base_url = str(stand_in_server.make_url("/v1/speak"))
+        client._ws_url = str(stand_in_server.make_url("/v1/speak").with_scheme("ws"))
+        yield client
@@ -0,0 +1,88 @@
+"""Local stand-in for the Deepgram speak endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from aiohttp import WSMsgType, web
+
+# Audio bytes returned per character of text (about 40 ms of 24 kHz linear16)
+BYTES_PER_CHAR = 2000
+CHUNK_SIZE = 4000
+
+
+class StandInDeepgram:
+    """
+    Serves /v1/speak with silent linear16 audio and records what it receives:
+    POST requests as in the REST API, and WebSocket sessions that answer each
+    Speak message with binary frames and each Flush with a Flushed event.
+    Each response waits ttfb seconds before its first byte and chunk_delay
+    between chunks, so requests can be caught in flight.
+    """
+
+    def __init__(self, ttfb: float = 0.0, chunk_delay: float = 0.0) -> None:
+        self.ttfb = ttfb
+        self.chunk_delay = chunk_delay
+        # Text of every speak request, in arrival order
+        self.requests: list[str] = []
+        # Responses being written, and those written to the end
+        self.active = 0
+        self.completed = 0
+        # WebSocket sessions opened, and those still open
+        self.sessions = 0
+        self.open_sessions = 0
+
+    def make_app(self) -> web.Application:
+        """Return the application serving the speak endpoint."""
+        app = web.Application()
+        app.router.add_post("/v1/speak", self._speak)
+        app.router.add_get("/v1/speak", self._speak_websocket)
+        return app
+
+    async def _speak(self, request: web.Request) -> web.StreamResponse:
+        text = await request.text()
+        self.requests.append(text)
+        self.active += 1
+        try:
+            await asyncio.sleep(self.ttfb)
+            response = web.StreamResponse(headers={"Content-Type": "audio/l16"})
+            await response.prepare(request)
+            audio = bytes(len(text) * BYTES_PER_CHAR)
+            for start in range(0, len(audio), CHUNK_SIZE):
+                await response.write(audio[start : start + CHUNK_SIZE])
+                await asyncio.sleep(self.chunk_delay)
+            await response.write_eof()
+            self.completed += 1
+            return response
+        finally:
+            self.active -= 1
+
+    async def _speak_websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sessions += 1
+        self.open_sessions += 1
+        flushes = 0
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                message = json.loads(msg.data)
+                if message["type"] == "Speak":
+                    self.requests.append(message["text"])
+                    await asyncio.sleep(self.ttfb)
+                    audio = bytes(len(message["text"]) * BYTES_PER_CHAR)
+                    for start in range(0, len(audio), CHUNK_SIZE):
+                        await ws.send_bytes(audio[start : start + CHUNK_SIZE])
+                        await asyncio.sleep(self.chunk_delay)
+                elif message["type"] == "Flush":
+                    flushes += 1
+                    await ws.send_str(json.dumps({"type": "Flushed", "sequence_id": flushes}))
+                elif message["type"] == "Close":
+                    self.completed += 1
+                    break
+        finally:
+            self.open_sessions -= 1
+        await ws.close()
+        return ws
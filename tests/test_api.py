@@ -0,0 +1,64 @@
+"""Hedged speak requests against the local stand-in server."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestServer
+
+from custom_components.deepgram_tts.api import HEDGE_MIN_SAMPLES, DeepgramTTSApiClient
+from custom_components.deepgram_tts.limiter import DeepgramRateLimiter
+
+from .stand_in_server import StandInDeepgram
+
+# Usual time to first byte, which sets the hedge delay
+USUAL_TTFB = 0.02
+
+
+@pytest.fixture
+async def hedging_client(stand_in_server: TestServer) -> AsyncGenerator[DeepgramTTSApiClient]:
+    """Return a hedging client with one limiter slot and a history of fast replies."""
+    async with aiohttp.ClientSession() as session:
+        client = DeepgramTTSApiClient(
+            "test-key", session, max_retries=0, hedging=True, limiter=DeepgramRateLimiter(2, 500, 5000)
+        )
+        client._base_url = str(stand_in_server.make_url("/v1/speak"))
+        client._ttfb_samples.extend([USUAL_TTFB] * HEDGE_MIN_SAMPLES)
+        yield client
+
+
+async def _speak(client: DeepgramTTSApiClient, sent: list[None]) -> bytes:
+    return b"".join(
+        [chunk async for chunk in client.async_stream_speech("Hello there.", on_request_sent=lambda: sent.append(None))]
+    )
+
+
+async def test_no_hedge_while_queued(
+    stand_in: StandInDeepgram, hedging_client: DeepgramTTSApiClient
+) -> None:
+    """Waiting for a limiter slot neither triggers a hedge nor counts as time to first byte."""
+    limiter = hedging_client._limiter
+    sent: list[None] = []
+    # Take every slot so the request queues well past the hedge delay
+    async with limiter.async_slot(), limiter.async_slot():
+        speak = asyncio.create_task(_speak(hedging_client, sent))
+        await asyncio.sleep(0.3)
+    assert await speak
+    assert len(stand_in.requests) == 1
+    assert len(sent) == 1
+    assert hedging_client._ttfb_samples[-1] < 0.2
+
+
+async def test_hedge_slow_request(
+    stand_in: StandInDeepgram, hedging_client: DeepgramTTSApiClient
+) -> None:
+    """A sent request without audio within the usual time gets a duplicate."""
+    stand_in.ttfb = 0.3
+    sent: list[None] = []
+    assert await _speak(hedging_client, sent)
+    assert len(stand_in.requests) == 2
+    # Only the first request reports being sent
+    assert len(sent) == 1
@@ -0,0 +1,58 @@
+"""Audio cache tiers under concurrent use."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from custom_components.deepgram_tts.cache import DeepgramAudioCache
+
+
+@pytest.fixture
+async def cache(tmp_path: Path) -> DeepgramAudioCache:
+    """Return a cache without a memory tier whose disk tier holds one entry."""
+    cache = DeepgramAudioCache(str(tmp_path), memory_max_bytes=0, disk_max_bytes=150)
+    await cache.async_load()
+    await cache.async_put("old", b"a" * 100)
+    return cache
+
+
+@pytest.mark.parametrize("evict_before_read", [True, False], ids=["file_removed", "file_read"])
+async def test_eviction_during_read(
+    cache: DeepgramAudioCache, monkeypatch: pytest.MonkeyPatch, evict_before_read: bool
+) -> None:
+    """A put evicting the entry being read neither raises nor miscounts the disk tier."""
+    reading = asyncio.Event()
+    evicted = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    read_file = DeepgramAudioCache._read_file
+
+    def slow_read(path: str) -> bytes:
+        if not evict_before_read:
+            data = read_file(path)
+        loop.call_soon_threadsafe(reading.set)
+        asyncio.run_coroutine_threadsafe(evicted.wait(), loop).result()
+        return read_file(path) if evict_before_read else data
+
+    monkeypatch.setattr(DeepgramAudioCache, "_read_file", staticmethod(slow_read))
+
+    async def evict() -> None:
+        await reading.wait()
+        await cache.async_put("new", b"b" * 100)
+        evicted.set()
+
+    data, _ = await asyncio.gather(cache.async_get("old"), evict())
+    assert data == (None if evict_before_read else b"a" * 100)
+    assert cache.stats["disk_entries"] == 1
+    assert cache.stats["disk_bytes"] == 100
+    assert await cache.async_get("new") == b"b" * 100
+
+
+async def test_concurrent_puts_count_once(cache: DeepgramAudioCache, tmp_path: Path) -> None:
+    """Concurrent puts of one key write a single file and count it once."""
+    await asyncio.gather(*(cache.async_put("same", b"c" * 40) for _ in range(5)))
+    assert cache.stats["disk_entries"] == 2
+    assert cache.stats["disk_bytes"] == 140
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["old.audio", "same.audio"]
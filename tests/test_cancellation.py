@@ -0,0 +1,105 @@
+"""Abandoning a stream stops its requests and text reading."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+
+import pytest
+
+from custom_components.deepgram_tts.api import DeepgramTTSApiClient
+from custom_components.deepgram_tts.stream_processor import AudioFormat, DeepgramStreamProcessor
+
+from .stand_in_server import StandInDeepgram
+
+AUDIO_FORMAT = AudioFormat("linear16", 24000)
+MODEL = "aura-2-thalia-en"
+
+
+class TextStream:
+    """LLM-like text stream that counts how many chunks were read."""
+
+    def __init__(self, sentences: int = 30, delay: float = 0.005) -> None:
+        self.sentences = sentences
+        self.delay = delay
+        self.reads = 0
+
+    async def __call__(self) -> AsyncGenerator[str]:
+        for index in range(self.sentences):
+            await asyncio.sleep(self.delay)
+            self.reads += 1
+            yield f"This is sentence number {index} of a long reply. "
+
+
+@pytest.fixture
+def processor(client: DeepgramTTSApiClient) -> DeepgramStreamProcessor:
+    """Return a processor with several requests in flight per stream."""
+    return DeepgramStreamProcessor(client, max_concurrency=3, pcm_processing=False)
+
+
+async def _assert_nothing_after(stand_in: StandInDeepgram, text: TextStream) -> None:
+    """Check that no request is sent and no text is read once the stream is gone."""
+    requests, reads = len(stand_in.requests), text.reads
+    assert requests
+    # In-flight responses were aborted rather than read to the end
+    assert stand_in.completed < requests
+    await asyncio.sleep(0.3)
+    assert len(stand_in.requests) == requests
+    assert text.reads == reads
+    assert stand_in.active == 0
+
+
+async def test_aclose_stops_requests(
+    stand_in: StandInDeepgram, processor: DeepgramStreamProcessor
+) -> None:
+    """Closing the stream after the first audio aborts everything outstanding."""
+    stand_in.chunk_delay = 0.02
+    text = TextStream()
+    chunks = 0
+    async with aclosing(processor.async_process_stream(text(), MODEL, AUDIO_FORMAT)) as stream:
+        async for _chunk in stream:
+            chunks += 1
+            # Wav header, then the first audio chunk
+            if chunks == 2:
+                break
+    await _assert_nothing_after(stand_in, text)
+    assert processor._client._limiter.active == 0
+
+
+async def test_cancel_stops_requests(
+    stand_in: StandInDeepgram, processor: DeepgramStreamProcessor
+) -> None:
+    """Cancelling the consumer aborts everything outstanding and propagates."""
+    stand_in.chunk_delay = 0.02
+    text = TextStream()
+    first_audio = asyncio.Event()
+
+    async def consume() -> None:
+        chunks = 0
+        async for _chunk in processor.async_process_stream(text(), MODEL, AUDIO_FORMAT):
+            chunks += 1
+            if chunks == 2:
+                first_audio.set()
+
+    task = asyncio.create_task(consume())
+    await first_audio.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await _assert_nothing_after(stand_in, text)
+    assert processor._client._limiter.active == 0
+
+
+async def test_complete_stream(
+    stand_in: StandInDeepgram, processor: DeepgramStreamProcessor
+) -> None:
+    """A stream read to the end synthesizes all of the text."""
+    text = TextStream(sentences=5)
+    audio = b"".join(
+        [chunk async for chunk in processor.async_process_stream(text(), MODEL, AUDIO_FORMAT)]
+    )
+    assert audio.startswith(b"RIFF")
+    assert text.reads == 5
+    assert "".join(stand_in.requests).count("sentence number") == 5
+    assert stand_in.completed == len(stand_in.requests)
@@ -0,0 +1,139 @@
+"""CPU-bound audio work must not block the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Generator
+
+import pytest
+
+from custom_components.deepgram_tts import stream_processor
+from custom_components.deepgram_tts.api import DeepgramTTSApiClient
+from custom_components.deepgram_tts.executor import AudioExecutor
+from custom_components.deepgram_tts.stream_processor import AudioFormat, DeepgramStreamProcessor
+
+# asyncio's own threshold for reporting a slow callback in debug mode
+MAX_LAG_S = 0.1
+MODEL = "aura-2-thalia-en"
+
+
+class LoopLagMonitor:
+    """Measure how late a periodic timer fires, i.e. how long the loop was blocked."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> LoopLagMonitor:
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, loop.time() - expected)
+
+
+@pytest.fixture
+def executor() -> Generator[AudioExecutor]:
+    """Return a two-worker pool whose threads are gone after the test."""
+    executor = AudioExecutor(max_workers=2)
+    yield executor
+    pool = executor._executor
+    executor.shutdown()
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def audio_work_on_loop(monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    """Record, per call of the CPU-bound audio functions, whether it ran on the event loop."""
+    calls: list[bool] = []
+    for name in ("assemble_audio", "process_pcm"):
+
+        def guarded(*args, _func=getattr(stream_processor, name)):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                calls.append(False)
+            else:
+                calls.append(True)
+            return _func(*args)
+
+        monkeypatch.setattr(stream_processor, name, guarded)
+    return calls
+
+
+async def test_monitor_detects_blocking() -> None:
+    """The monitor sees a blocking call on the loop."""
+    async with LoopLagMonitor() as monitor:
+        await asyncio.sleep(0.02)
+        time.sleep(0.2)
+        await asyncio.sleep(0.02)
+    assert monitor.max_lag >= 0.15
+
+
+async def test_executor_is_bounded(executor: AudioExecutor) -> None:
+    """Blocking jobs run off the loop, at most max_workers at a time."""
+    running = peak = 0
+    lock = threading.Lock()
+
+    def job(value: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return value * 2
+
+    async with LoopLagMonitor() as monitor:
+        results = await asyncio.gather(*(executor.async_run(job, value) for value in range(6)))
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert peak == 2
+    assert monitor.max_lag < MAX_LAG_S
+
+
+async def test_satellite_burst_keeps_loop_responsive(
+    client: DeepgramTTSApiClient, executor: AudioExecutor, audio_work_on_loop: list[bool]
+) -> None:
+    """A burst of messages and streams with PCM processing keeps audio work off the loop."""
+    processor = DeepgramStreamProcessor(
+        client, max_concurrency=3, pcm_processing=True, executor=executor
+    )
+    text = " ".join(f"Announcement sentence {index} for every room." for index in range(40))
+    audio_format = AudioFormat("linear16", 24000)
+
+    async def reply(satellite: int):
+        yield f"Satellite {satellite} answers. "
+        yield "The lights are on."
+
+    async def stream(satellite: int) -> bytes:
+        return b"".join(
+            [chunk async for chunk in processor.async_process_stream(reply(satellite), MODEL, audio_format)]
+        )
+
+    async with LoopLagMonitor() as monitor:
+        files = await asyncio.gather(
+            *(
+                processor.async_synthesize_long_form(
+                    f"Satellite {satellite}. {text}", MODEL, audio_format=audio_format
+                )
+                for satellite in range(3)
+            ),
+            *(stream(satellite) for satellite in range(3)),
+        )
+    assert all(audio.startswith(b"RIFF") for audio in files)
+    assert audio_work_on_loop and not any(audio_work_on_loop)
+    assert monitor.max_lag < MAX_LAG_S
@@ -0,0 +1,70 @@
+"""Incremental sentence segmentation and its throughput on long token streams."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from custom_components.deepgram_tts.stream_processor import SentenceSegmenter
+
+WORDS = ("The", " lights", " in", " the", " kitchen", " are", " at", " 2.5", " percent", ",", " and")
+
+
+def _tokens(count: int, punctuation: bool = True) -> list[str]:
+    """Return LLM-like tokens, with a sentence end every 15 tokens if punctuation is set."""
+    tokens = []
+    for index in range(count):
+        if punctuation and index % 15 == 14:
+            tokens.append(".")
+        else:
+            tokens.append(WORDS[index % len(WORDS)])
+    return tokens
+
+
+def _segment(tokens: list[str]) -> list[str]:
+    segmenter = SentenceSegmenter()
+    sentences = []
+    for token in tokens:
+        sentences.extend(segmenter.feed(token))
+    if rest := segmenter.flush():
+        sentences.append(rest)
+    return sentences
+
+
+def _seconds(tokens: list[str]) -> float:
+    """Return the best of three runs, to reduce scheduling noise."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        _segment(tokens)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def test_token_stream_matches_whole_text() -> None:
+    """Feeding token by token gives the same sentences as feeding everything at once."""
+    tokens = _tokens(300)
+    whole = SentenceSegmenter()
+    expected = whole.feed("".join(tokens))
+    if rest := whole.flush():
+        expected.append(rest)
+    assert _segment(tokens) == expected
+    # Decimals do not end a sentence
+    assert all(sentence.endswith(".") for sentence in expected[:-1])
+    assert any("2.5" in sentence for sentence in expected)
+
+
+@pytest.mark.parametrize("punctuation", [True, False], ids=["sentences", "no_sentence_end"])
+def test_10k_token_throughput_is_linear(
+    punctuation: bool, record_property: pytest.RecordProperty
+) -> None:
+    """Micro-benchmark: 10k-token streams, and four times as many, take proportional time."""
+    seconds_10k = _seconds(_tokens(10_000, punctuation))
+    record_property("tokens_per_second_10k", round(10_000 / seconds_10k))
+    # Far below the rate at which an LLM produces tokens
+    assert seconds_10k < 0.5
+    seconds_40k = _seconds(_tokens(40_000, punctuation))
+    record_property("tokens_per_second_40k", round(40_000 / seconds_40k))
+    # Linear work gives a ratio of about 4, rescanning the buffer about 16
+    assert seconds_40k / seconds_10k < 8
@@ -0,0 +1,88 @@
+"""Time to first audio of streamed replies on a slow LLM token stream."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.tts import TTSAudioRequest
+
+from custom_components.deepgram_tts.api import DeepgramTTSApiClient
+from custom_components.deepgram_tts.const import DOMAIN
+from custom_components.deepgram_tts.stream_processor import DeepgramStreamProcessor
+from custom_components.deepgram_tts.tts import DeepgramTtsEntity
+
+from .stand_in_server import StandInDeepgram
+
+REPLY = (
+    "Sure, I have turned on the kitchen lights. "
+    "The living room is still at twenty one degrees. "
+    "Is there anything else I can do for you today?"
+)
+# Seconds between tokens, about what a local LLM manages
+TOKEN_DELAY = 0.04
+
+
+async def _slow_tokens() -> AsyncGenerator[str]:
+    """Yield the reply word by word like an LLM."""
+    for index, word in enumerate(REPLY.split(" ")):
+        await asyncio.sleep(TOKEN_DELAY)
+        yield word if index == 0 else f" {word}"
+
+
+async def _drained_tokens() -> AsyncGenerator[str]:
+    """Yield the reply only once the LLM is done, as before incremental streaming."""
+    yield "".join([token async for token in _slow_tokens()])
+
+
+@pytest.fixture
+def entity(client: DeepgramTTSApiClient) -> DeepgramTtsEntity:
+    """Return a TTS entity streaming linear16 through the stand-in server."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"api_key": "test-key"},
+        options={"voice": "aura-2-thalia-en", "encoding": "linear16", "sample_rate": 24000},
+    )
+    processor = DeepgramStreamProcessor(client, pcm_processing=False)
+    return DeepgramTtsEntity(config_entry, client, processor, None, None)
+
+
+async def _time_to_first_audio(
+    entity: DeepgramTtsEntity, message_gen: AsyncGenerator[str]
+) -> float:
+    """Return the seconds from the request until the first audio after the wav header."""
+    started = time.monotonic()
+    response = await entity.async_stream_tts_audio(
+        TTSAudioRequest(language="en", options={}, message_gen=message_gen)
+    )
+    first_audio = None
+    async for chunk in response.data_gen:
+        if first_audio is None and not chunk.startswith(b"RIFF"):
+            first_audio = time.monotonic() - started
+    assert response.extension == "wav"
+    return first_audio
+
+
+async def test_first_audio_while_llm_generates(
+    stand_in: StandInDeepgram,
+    entity: DeepgramTtsEntity,
+    record_property: pytest.RecordProperty,
+) -> None:
+    """The first sentence is spoken before the LLM has finished the reply."""
+    stand_in.ttfb = 0.05
+    llm_seconds = TOKEN_DELAY * len(REPLY.split(" "))
+    incremental = await _time_to_first_audio(entity, _slow_tokens())
+    incremental_requests = list(stand_in.requests)
+    stand_in.requests.clear()
+    drained = await _time_to_first_audio(entity, _drained_tokens())
+    record_property("time_to_first_audio_ms", round(incremental * 1000))
+    record_property("time_to_first_audio_drained_ms", round(drained * 1000))
+    # Synthesis started on partial text and the whole reply was still spoken
+    assert len(incremental_requests) > 1
+    assert " ".join(incremental_requests).split() == REPLY.split()
+    assert incremental < llm_seconds / 2
+    assert drained > llm_seconds
@@ -0,0 +1,63 @@
+"""Output format options as processed by Home Assistant's TTS manager."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.tts import SpeechManager
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.deepgram_tts.const import DOMAIN
+from custom_components.deepgram_tts.tts import DeepgramTtsEntity
+
+ENTRY_OPTIONS = {"voice": "aura-2-thalia-en", "encoding": "linear16", "sample_rate": 16000}
+
+
+@pytest.fixture
+def entity() -> DeepgramTtsEntity:
+    """Return an entity configured for 16 kHz linear16."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={"api_key": "test-key"}, options=ENTRY_OPTIONS)
+    models = SimpleNamespace(catalog=SimpleNamespace(languages=["en"]))
+    return DeepgramTtsEntity(config_entry, None, None, None, models)
+
+
+def _format(hass: HomeAssistant, entity: DeepgramTtsEntity, options: dict | None):
+    """Merge call options the way Home Assistant does, then resolve the format."""
+    manager = SpeechManager(hass, False, "", 0)
+    _language, merged = manager.process_options(entity, "en", options)
+    return entity._audio_format(merged)
+
+
+@pytest.mark.parametrize(
+    ("options", "expected"),
+    [
+        (None, ("linear16", 16000, None)),
+        ({"sample_rate": 8000}, ("linear16", 8000, None)),
+        # The entry's 16 kHz does not carry over to other encodings
+        ({"encoding": "mp3"}, ("mp3", None, None)),
+        ({"encoding": "mulaw"}, ("mulaw", 8000, None)),
+        ({"encoding": "opus", "bit_rate": 12000}, ("opus", None, 12000)),
+    ],
+)
+async def test_call_options(
+    hass: HomeAssistant, entity: DeepgramTtsEntity, options: dict | None, expected: tuple
+) -> None:
+    """Call options override the entry's format, whose rates only apply to its own encoding."""
+    audio_format = _format(hass, entity, options)
+    assert (audio_format.encoding, audio_format.sample_rate, audio_format.bit_rate) == expected
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"encoding": "mp3", "sample_rate": 16000}, {"encoding": "mp3", "bit_rate": 64000}, {"encoding": "wav"}],
+)
+async def test_invalid_call_options(
+    hass: HomeAssistant, entity: DeepgramTtsEntity, options: dict
+) -> None:
+    """Rates that the requested encoding does not accept are rejected."""
+    with pytest.raises(ServiceValidationError):
+        _format(hass, entity, options)
@@ -0,0 +1,75 @@
+"""WebSocket transport against the local stand-in server."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+
+import pytest
+
+from custom_components.deepgram_tts.api import DeepgramTTSApiClient
+from custom_components.deepgram_tts.const import TRANSPORT_WEBSOCKET
+from custom_components.deepgram_tts.stream_processor import AudioFormat, DeepgramStreamProcessor
+
+from .stand_in_server import BYTES_PER_CHAR, StandInDeepgram
+
+MODEL = "aura-2-thalia-en"
+# Wav header of a stream of unknown length
+WAV_HEADER_SIZE = 44
+
+
+async def _text(sentences: int, delay: float = 0.005) -> AsyncGenerator[str]:
+    for index in range(sentences):
+        await asyncio.sleep(delay)
+        yield f"Sentence {index} arrives token by token. "
+
+
+@pytest.fixture
+def processor(client: DeepgramTTSApiClient) -> DeepgramStreamProcessor:
+    """Return a processor using the WebSocket transport."""
+    return DeepgramStreamProcessor(client, transport=TRANSPORT_WEBSOCKET, pcm_processing=False)
+
+
+async def test_one_session_per_stream(
+    stand_in: StandInDeepgram, processor: DeepgramStreamProcessor
+) -> None:
+    """All sentences of a stream go over one session and all audio comes back."""
+    audio_format = processor.output_format(AudioFormat("linear16", 24000))
+    audio = b"".join(
+        [chunk async for chunk in processor.async_process_stream(_text(4), MODEL, audio_format)]
+    )
+    assert stand_in.sessions == 1
+    assert stand_in.completed == 1
+    assert stand_in.open_sessions == 0
+    assert "".join(stand_in.requests).count("token by token") == 4
+    assert audio[:4] == b"RIFF"
+    assert len(audio) == WAV_HEADER_SIZE + len("".join(stand_in.requests)) * BYTES_PER_CHAR
+
+
+async def test_compressed_format_falls_back_to_linear16(
+    processor: DeepgramStreamProcessor,
+) -> None:
+    """The WebSocket transport only streams raw audio."""
+    audio_format = processor.output_format(AudioFormat("mp3"))
+    assert (audio_format.encoding, audio_format.sample_rate) == ("linear16", 24000)
+    assert audio_format.extension == "wav"
+
+
+async def test_abandoned_stream_closes_session(
+    stand_in: StandInDeepgram, processor: DeepgramStreamProcessor
+) -> None:
+    """Closing the stream early closes the session and stops sending text."""
+    stand_in.chunk_delay = 0.02
+    audio_format = processor.output_format(AudioFormat("linear16", 24000))
+    async with aclosing(
+        processor.async_process_stream(_text(30), MODEL, audio_format)
+    ) as stream:
+        async for chunk in stream:
+            if not chunk.startswith(b"RIFF"):
+                break
+    requests = len(stand_in.requests)
+    await asyncio.sleep(0.3)
+    assert len(stand_in.requests) == requests < 30
+    assert stand_in.open_sessions == 0
+    assert processor._client._limiter.active == 0